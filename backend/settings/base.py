@@ -3,6 +3,8 @@ from os import getenv, path
 from pathlib import Path
 from datetime import timedelta
 
+from celery.schedules import crontab
+
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,6 +33,7 @@ DJANGO_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -55,7 +58,7 @@ LOCAL_APPS = [
     "core_apps.issues",
     "core_apps.reports",
     # "core_apps.posts",
-    # "core_apps.ratings",
+    "core_apps.ratings",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -108,6 +111,18 @@ DATABASES = {
     }
 }
 
+# Une transaction d'écriture ouverte bloque le flux des changements des issues
+# (voir core_apps/issues/changefeed.py). Si DB_IDLE_IN_TRANSACTION_TIMEOUT est
+# défini (ex. "60s"), les sessions restées inactives dans une transaction plus
+# longtemps sont coupées. Le délai vaut pour toutes les connexions de ce
+# processus : le définir pour les serveurs web, pas pour les workers ou
+# commandes qui gardent volontairement une transaction ouverte (shell, migrations).
+DB_IDLE_IN_TRANSACTION_TIMEOUT = getenv("DB_IDLE_IN_TRANSACTION_TIMEOUT")
+if DB_IDLE_IN_TRANSACTION_TIMEOUT:
+    DATABASES["default"]["OPTIONS"] = {
+        "options": f"-c idle_in_transaction_session_timeout={DB_IDLE_IN_TRANSACTION_TIMEOUT}",
+    }
+
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.Argon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
@@ -148,6 +163,16 @@ STATIC_URL = "/static/"
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+MEDIA_URL = "/media/"
+
+MEDIA_ROOT = os.path.join(BASE_DIR, "mediafiles")
+
+AVATAR_BACKEND = getenv(
+    "AVATAR_BACKEND", "core_apps.profiles.avatars.CloudinaryAvatarBackend"
+)
+
+AVATAR_PROCESS_POOL_SIZE = int(getenv("AVATAR_PROCESS_POOL_SIZE", "2"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
@@ -157,6 +182,36 @@ ADMIN_URL = "hidden/"
 if USE_TZ:
     CELERY_TIMEZONE = TIME_ZONE
 
+# Cache partagé entre les workers (Redis) si REDIS_URL est défini, sinon cache local en mémoire
+REDIS_URL = getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Encodeur JSON des réponses de GenericJSONRenderer (json_dumps pour la bibliothèque standard)
+JSON_RENDERER_BACKEND = getenv(
+    "JSON_RENDERER_BACKEND", "core_apps.common.renderers.orjson_dumps"
+)
+
+# Backend d'envoi des notifications, utilisé par la tâche send_notifications qui tourne déjà dans un worker Celery
+NOTIFICATION_EMAIL_BACKEND = getenv(
+    "NOTIFICATION_EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
+)
+
+# Durée de mise en cache de l'utilisateur authentifié et de son profil (0 désactive le cache)
+AUTH_USER_CACHE_TTL = int(getenv("AUTH_USER_CACHE_TTL", "60"))
+
 CELERY_BROKER_URL = getenv("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = getenv("CELERY_RESULT_BACKEND")
 CELERY_ACCEPT_CONTENT = ["application/json"]
@@ -180,7 +235,32 @@ CELERY_WORKER_SEND_TASK_EVENTS = True
 CELERY_BEAT_SCHEDULE = {
     "update-reputations-every-day": {
         "task": "update_reputation_score",
-    }
+        "schedule": crontab(hour=2, minute=0),
+    },
+    "flush-content-views-every-10-seconds": {
+        "task": "flush_content_views",
+        "schedule": 10.0,
+    },
+    "reconcile-issue-view-counts-every-night": {
+        "task": "reconcile_issue_view_counts",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "assign-issue-backlog-every-5-minutes": {
+        "task": "assign_issue_backlog",
+        "schedule": timedelta(minutes=5),
+    },
+    "escalate-overdue-issues-every-15-minutes": {
+        "task": "escalate_overdue_issues",
+        "schedule": timedelta(minutes=15),
+    },
+    "prune-issue-events-every-night": {
+        "task": "prune_issue_events",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "rebuild-technician-rankings-every-night": {
+        "task": "rebuild_technician_rankings",
+        "schedule": crontab(hour=2, minute=30),
+    },
 }
 # Nom du cookie utilisé pour l'accès
 COOKIE_NAME = "access"
@@ -212,17 +292,22 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
 
     # Spécifie les classes de limitation de débit (throttling) par défaut
-    # Applique des limites différentes pour les utilisateurs anonymes et authentifiés
+    # Applique des limites différentes pour les utilisateurs anonymes et authentifiés,
+    # et une limite propre aux vues qui définissent throttle_scope
+    # Fenêtre glissante approximative, partagée entre les workers via Redis si REDIS_URL est défini
     "DEFAULT_THROTTLE_CLASSES": (
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "core_apps.common.throttling.AnonSlidingWindowThrottle",
+        "core_apps.common.throttling.UserSlidingWindowThrottle",
+        "core_apps.common.throttling.ScopedSlidingWindowThrottle",
     ),
 
     # Les utilisateurs anonymes sont limités à 200 requêtes par jour
     # Les utilisateurs authentifiés sont limités à 500 requêtes par jour
+    # Les signalements sont limités à 10 par heure
     "DEFAULT_THROTTLE_RATES": {
         "anon": "200/day",
         "user": "500/day",
+        "reports": "10/hour",
     },
 }
 
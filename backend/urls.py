@@ -31,7 +31,7 @@ urlpatterns = [
     path("api/v1/apartments/", include("core_apps.apartments.urls")),
     path("api/v1/issues/", include("core_apps.issues.urls")),
     path("api/v1/reports/", include("core_apps.reports.urls")),
-    # path("api/v1/ratings/", include("core_apps.ratings.urls")),
+    path("api/v1/ratings/", include("core_apps.ratings.urls")),
     # path("api/v1/posts/", include("core_apps.posts.urls")),
 ]
 if settings.DEBUG:
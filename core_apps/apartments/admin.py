@@ -1,5 +1,8 @@
 from django.contrib import admin
 from .models import Apartment
+from .occupancy import invalidate_occupancy_summary
+
+
 @admin.register(Apartment)
 class ApartmentAdmin(admin.ModelAdmin):
     list_display = ["id", "unit_number", "building", "floor", "tenant"]
@@ -7,4 +10,18 @@ class ApartmentAdmin(admin.ModelAdmin):
     list_filter = ["building", "floor"]
     search_fields = ["unit_number"]
     ordering = ["building", "floor"]
-    autocomplete_fields = ["tenant"]
\ No newline at end of file
+    autocomplete_fields = ["tenant"]
+
+    # Admin edits can move apartments between buildings and floors: drop the
+    # cached occupancy counters rather than computing deltas
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_occupancy_summary()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_occupancy_summary()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_occupancy_summary()
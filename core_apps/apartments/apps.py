@@ -6,3 +6,6 @@ class ApartmentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.apartments"
     verbose_name = _("Manage Apartments")
+
+    def ready(self):
+        import core_apps.apartments.signals  # noqa: F401
@@ -0,0 +1,117 @@
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, When
+
+from core_apps.common.response_cache import invalidate_responses
+from core_apps.profiles.models import Profile
+
+from .models import Apartment
+from .occupancy import record_occupancy_changes
+
+User = get_user_model()
+
+# (apartment id, tenant id) as sent by the client, tenant may be None on release
+Pair = Tuple[str, str | None]
+
+
+def _conflict(apartment_id, tenant_id, reason: str) -> dict:
+    return {"apartment": str(apartment_id), "tenant": tenant_id and str(tenant_id), "reason": reason}
+
+
+def _lock_apartments(apartment_ids: Iterable) -> dict:
+    # Rows are locked in primary-key order so concurrent bulk calls cannot deadlock
+    rows = (
+        Apartment.objects.select_for_update()
+        .filter(id__in=set(apartment_ids))
+        .order_by("pkid")
+        .values_list("id", "pkid", "tenant_id", "building", "floor")
+    )
+    return {row[0]: row[1:] for row in rows}
+
+
+def _record_occupancy(apartments: dict, apartment_pkids: Iterable, occupied: int) -> None:
+    locations = {pkid: (building, floor) for pkid, _, building, floor in apartments.values()}
+    deltas = Counter(locations[pkid] for pkid in apartment_pkids)
+    record_occupancy_changes({group: (0, occupied * count) for group, count in deltas.items()})
+
+
+def _resolve_tenants(tenant_ids: Iterable) -> dict:
+    rows = User.objects.filter(
+        id__in=set(tenant_ids), profile__occupation=Profile.Occupation.TENANT
+    ).values_list("id", "pkid")
+    return dict(rows)
+
+
+def bulk_assign(pairs: List[Pair]) -> Tuple[List[dict], List[dict]]:
+    """
+    Assigns every vacant apartment of `pairs` to its tenant in one transaction.
+
+    Costs three statements whatever the number of pairs: one tenant lookup, one
+    SELECT ... FOR UPDATE on the apartments and one UPDATE with a CASE per row.
+    Returns the assigned pairs and the pairs that lost, with the reason.
+    """
+    assigned, conflicts = [], []
+
+    with transaction.atomic():
+        tenants = _resolve_tenants(tenant_id for _, tenant_id in pairs)
+        apartments = _lock_apartments(apartment_id for apartment_id, _ in pairs)
+
+        winners = {}  # apartment pkid -> tenant pkid
+        for apartment_id, tenant_id in pairs:
+            if tenant_id not in tenants:
+                conflicts.append(_conflict(apartment_id, tenant_id, "Tenant not found."))
+            elif apartment_id not in apartments:
+                conflicts.append(_conflict(apartment_id, tenant_id, "Apartment not found."))
+            elif apartments[apartment_id][1] is not None or apartments[apartment_id][0] in winners:
+                conflicts.append(_conflict(apartment_id, tenant_id, "Apartment is already assigned."))
+            else:
+                winners[apartments[apartment_id][0]] = tenants[tenant_id]
+                assigned.append({"apartment": str(apartment_id), "tenant": str(tenant_id)})
+
+        if winners:
+            Apartment.objects.filter(pkid__in=list(winners)).update(
+                tenant_id=Case(*(When(pkid=pkid, then=tenant_pkid) for pkid, tenant_pkid in winners.items()))
+            )
+            _record_occupancy(apartments, winners, occupied=1)
+            invalidate_responses(Apartment)
+
+    return assigned, conflicts
+
+
+def bulk_release(pairs: List[Pair]) -> Tuple[List[dict], List[dict]]:
+    """
+    Releases every apartment of `pairs` in one transaction.
+
+    When a pair names a tenant, the apartment is only released if that tenant
+    still holds it. Costs at most three statements whatever the number of pairs.
+    """
+    released, conflicts = [], []
+
+    with transaction.atomic():
+        expected_ids = [tenant_id for _, tenant_id in pairs if tenant_id is not None]
+        tenants = _resolve_tenants(expected_ids) if expected_ids else {}
+        apartments = _lock_apartments(apartment_id for apartment_id, _ in pairs)
+
+        winners = set()
+        for apartment_id, tenant_id in pairs:
+            if apartment_id not in apartments:
+                conflicts.append(_conflict(apartment_id, tenant_id, "Apartment not found."))
+                continue
+            pkid, current_tenant = apartments[apartment_id][:2]
+            if current_tenant is None or pkid in winners:
+                conflicts.append(_conflict(apartment_id, tenant_id, "Apartment is not currently rented."))
+            elif tenant_id is not None and tenants.get(tenant_id) != current_tenant:
+                conflicts.append(_conflict(apartment_id, tenant_id, "Apartment is rented by another tenant."))
+            else:
+                winners.add(pkid)
+                released.append({"apartment": str(apartment_id), "tenant": tenant_id and str(tenant_id)})
+
+        if winners:
+            Apartment.objects.filter(pkid__in=winners).update(tenant=None)
+            _record_occupancy(apartments, winners, occupied=-1)
+            invalidate_responses(Apartment)
+
+    return released, conflicts
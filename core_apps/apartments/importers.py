@@ -0,0 +1,162 @@
+import csv
+import json
+import logging
+from collections import Counter
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+
+from core_apps.common.response_cache import invalidate_responses
+
+from .models import Apartment
+from .occupancy import record_occupancy_changes
+from .serializers import ApartmentImportSerializer
+
+logger = logging.getLogger(__name__)
+
+# (line number, parsed row or None, parse error or None)
+ImportRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+def iter_csv_rows(stream: Iterable[bytes]) -> Iterator[ImportRow]:
+    """
+    Yields rows of a CSV upload with a header line, one line at a time.
+
+    Every line is decoded and parsed on its own so an undecodable or
+    malformed line is reported as a single error and the rest of the upload
+    is still imported. Quoted values may therefore not span several lines.
+    """
+    header = None
+    for line_num, raw in enumerate(stream, start=1):
+        try:
+            text = raw.decode("utf-8-sig" if line_num == 1 else "utf-8")
+            values = next(csv.reader([text], strict=True), [])
+        except (csv.Error, UnicodeDecodeError) as e:
+            if header is None:
+                yield line_num, None, f"Unreadable CSV header: {e}"
+                return
+            yield line_num, None, f"Unreadable CSV line: {e}"
+            continue
+
+        if not values:
+            continue
+        if header is None:
+            header = values
+            continue
+        if len(values) > len(header):
+            yield line_num, None, "Line has more values than the header."
+            continue
+        yield line_num, dict(zip(header, values + [None] * (len(header) - len(values)))), None
+
+
+def iter_ndjson_rows(stream: Iterable[bytes]) -> Iterator[ImportRow]:
+    """
+    Yields rows of an NDJSON upload (one JSON object per line).
+    """
+    for line_num, raw in enumerate(stream, start=1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError:
+            yield line_num, None, "Invalid JSON."
+            continue
+        if not isinstance(row, dict):
+            yield line_num, None, "Each line must be a JSON object."
+            continue
+        yield line_num, row, None
+
+
+class ApartmentImporter:
+    """
+    Imports apartments from an iterator of rows in fixed-size batches.
+
+    Each batch costs one SELECT to find unit numbers that already exist and
+    one multi-row INSERT, so memory stays bounded by the batch size whatever
+    the size of the upload.
+    """
+
+    def __init__(self, batch_size: int = 500, max_reported_errors: int = 1000) -> None:
+        self.batch_size = batch_size
+        self.max_reported_errors = max_reported_errors
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, rows: Iterator[ImportRow]) -> dict:
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.import_batch(batch)
+        return self.report()
+
+    def import_batch(self, batch: list) -> None:
+        valid = {}  # unit_number -> (line, validated data)
+
+        for line, row, error in batch:
+            if error is not None:
+                self.add_error(line, {"non_field_errors": [error]})
+                continue
+
+            serializer = ApartmentImportSerializer(data=row)
+            if not serializer.is_valid():
+                self.add_error(line, serializer.errors)
+                continue
+
+            unit_number = serializer.validated_data["unit_number"]
+            if unit_number in valid:
+                self.add_error(
+                    line,
+                    {"unit_number": [f"Duplicate of line {valid[unit_number][0]}."]},
+                )
+                continue
+            valid[unit_number] = (line, serializer.validated_data)
+
+        # A concurrent writer may claim a unit number between the check and the
+        # insert, in which case the check is run again once before giving up.
+        for attempt in range(2):
+            self.discard_existing(valid)
+            if not valid:
+                return
+            try:
+                with transaction.atomic():
+                    Apartment.objects.bulk_create(
+                        [Apartment(**data) for _, data in valid.values()]
+                    )
+            except IntegrityError:
+                logger.warning("Bulk apartment import batch conflicted, retrying")
+                continue
+            self.created += len(valid)
+            added = Counter((data["building"], data["floor"]) for _, data in valid.values())
+            record_occupancy_changes({group: (count, 0) for group, count in added.items()})
+            invalidate_responses(Apartment)
+            return
+
+        for line, _ in valid.values():
+            self.add_error(line, {"non_field_errors": ["Could not be inserted, please retry."]})
+
+    def discard_existing(self, valid: dict) -> None:
+        existing = Apartment.objects.filter(unit_number__in=list(valid)).values_list(
+            "unit_number", flat=True
+        )
+        for unit_number in existing:
+            line, _ = valid.pop(unit_number)
+            self.add_error(
+                line, {"unit_number": ["apartment with this Unit Number already exists."]}
+            )
+
+    def add_error(self, line: int, errors: dict) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+    def report(self) -> dict:
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "row_errors": self.errors,
+            "row_errors_truncated": self.failed > len(self.errors),
+        }
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("apartments", "0002_alter_apartment_tenant"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="apartment",
+            index=models.Index(
+                condition=models.Q(("tenant__isnull", True)),
+                fields=["-created_at", "-pkid"],
+                name="apartment_available_idx",
+            ),
+        ),
+    ]
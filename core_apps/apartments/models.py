@@ -1,10 +1,23 @@
-from django.db import models
+from typing import Optional, Tuple
+
+from django.db import connection, models
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
-from core_apps.common.models import TimeStampedModel
+from core_apps.common.models import TimeStampedModel, TimeStampedQuerySet
+from core_apps.common.response_cache import invalidate_responses
 User = get_user_model()
 
 
+class ApartmentQuerySet(TimeStampedQuerySet):
+    # Compare-and-set: the occupancy check lives in the WHERE clause, so
+    # concurrent callers cannot both succeed. Returns the rowcount.
+    def assign(self, tenant) -> int:
+        assigned = self.filter(tenant__isnull=True).update(tenant=tenant)
+        if assigned:
+            invalidate_responses(self.model)
+        return assigned
+
+
 class Apartment(TimeStampedModel):
     unit_number = models.CharField(
         max_length=10, unique=True, verbose_name=_("Unit Number")
@@ -20,5 +33,40 @@ class Apartment(TimeStampedModel):
         verbose_name=_("Tenant"),
     )
 
+    objects = ApartmentQuerySet.as_manager()
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            # Serves the keyset-paginated listing of available apartments
+            models.Index(
+                fields=["-created_at", "-pkid"],
+                condition=models.Q(tenant__isnull=True),
+                name="apartment_available_idx",
+            ),
+        ]
+
+    @classmethod
+    def release_rented(cls, apartment_id, tenant_pkid: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """
+        Releases a rented apartment in a single UPDATE ... RETURNING, limited to
+        the given tenant when one is passed. Returns the (building, floor) of
+        the released apartment, or None when nothing was released.
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        sql = (
+            f"UPDATE {table} SET tenant_id = NULL, updated_at = now() "
+            "WHERE id = %s AND tenant_id IS NOT NULL"
+        )
+        params = [apartment_id]
+        if tenant_pkid is not None:
+            sql += " AND tenant_id = %s"
+            params.append(tenant_pkid)
+        with connection.cursor() as cursor:
+            cursor.execute(sql + " RETURNING building, floor", params)
+            row = cursor.fetchone()
+        if row:
+            invalidate_responses(cls)
+        return row
+
     def __str__(self) -> str:
         return f"Unit: {self.unit_number} -  Building: {self.building} - Floor: {self.floor}"
\ No newline at end of file
@@ -0,0 +1,155 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Apartment
+
+logger = logging.getLogger(__name__)
+
+OCCUPANCY_CACHE_TIMEOUT = 60 * 60
+# Every counter is keyed on this generation, bumping it retires them all
+GENERATION_KEY = "apartments:occupancy:generation"
+
+# (building, floor) -> (total delta, occupied delta)
+OccupancyDeltas = Dict[Tuple[str, int], Tuple[int, int]]
+
+
+def _get_generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Seeded from the clock, an evicted generation is never reused
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _groups_key(generation: int) -> str:
+    return f"apartments:occupancy:{generation}:groups"
+
+
+def _counter_key(generation: int, building: str, floor: int, field: str) -> str:
+    return f"apartments:occupancy:{generation}:{quote(building, safe='')}:{floor}:{field}"
+
+
+def _read_summary(generation: int) -> Optional[List[dict]]:
+    groups = cache.get(_groups_key(generation))
+    if groups is None:
+        return None
+    keys = {
+        (building, floor): (
+            _counter_key(generation, building, floor, "total"),
+            _counter_key(generation, building, floor, "occupied"),
+        )
+        for building, floor in groups
+    }
+    counters = cache.get_many([key for pair in keys.values() for key in pair])
+    if len(counters) != 2 * len(keys):
+        return None
+
+    summary = []
+    for (building, floor), (total_key, occupied_key) in keys.items():
+        total, occupied = counters[total_key], counters[occupied_key]
+        summary.append(
+            {
+                "building": building,
+                "floor": floor,
+                "total": total,
+                "occupied": occupied,
+                "vacant": total - occupied,
+            }
+        )
+    return summary
+
+
+def rebuild_occupancy_summary() -> List[dict]:
+    """
+    Recomputes occupancy with a single GROUP BY and stores one cache counter
+    per (building, floor) so later changes can be applied as increments.
+
+    Counters of the current generation that still exist are kept: they
+    already carry every committed change, while the GROUP BY may miss
+    changes committed after it ran. A change that finds its counter missing
+    bumps the generation, which retires whatever this rebuild stored.
+    """
+    generation = _get_generation()
+    rows = list(
+        Apartment.objects.order_by("building", "floor")
+        .values("building", "floor")
+        .annotate(total=Count("pkid"), occupied=Count("tenant"))
+    )
+
+    for row in rows:
+        for field in ("total", "occupied"):
+            key = _counter_key(generation, row["building"], row["floor"], field)
+            cache.add(key, row[field], OCCUPANCY_CACHE_TIMEOUT)
+    cache.set(
+        _groups_key(generation),
+        [(row["building"], row["floor"]) for row in rows],
+        OCCUPANCY_CACHE_TIMEOUT,
+    )
+
+    # Serve what later reads will serve, the GROUP BY only if it was retired meanwhile
+    summary = _read_summary(generation)
+    if summary is not None:
+        return summary
+    return [dict(row, vacant=row["total"] - row["occupied"]) for row in rows]
+
+
+def get_occupancy_summary() -> List[dict]:
+    """
+    Returns total/occupied/vacant counts per (building, floor) from the cache,
+    hitting the database only when the cached counters are missing.
+    """
+    summary = _read_summary(_get_generation())
+    if summary is not None:
+        return summary
+    return rebuild_occupancy_summary()
+
+
+def _retire_counters() -> None:
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # No generation, no counter to retire
+        pass
+
+
+def invalidate_occupancy_summary() -> None:
+    """
+    Retires every cached counter once the current transaction commits, for
+    changes that are not recorded as deltas (admin edits, deleted tenants).
+    """
+    transaction.on_commit(_retire_counters)
+
+
+def _apply_occupancy_deltas(deltas: OccupancyDeltas) -> None:
+    generation = _get_generation()
+    for (building, floor), (total, occupied) in deltas.items():
+        try:
+            if total:
+                cache.incr(_counter_key(generation, building, floor, "total"), total)
+            if occupied:
+                cache.incr(_counter_key(generation, building, floor, "occupied"), occupied)
+        except ValueError:
+            # A new (building, floor) or an expired counter: the next read rebuilds
+            _retire_counters()
+            return
+
+
+def record_occupancy_changes(deltas: OccupancyDeltas) -> None:
+    """
+    Applies occupancy deltas to the cached counters once the current
+    transaction commits, so rolled back changes are never counted.
+    """
+    deltas = {group: delta for group, delta in deltas.items() if any(delta)}
+    if deltas:
+        transaction.on_commit(lambda: _apply_occupancy_deltas(deltas))
+
+
+def record_occupancy_change(building: str, floor: int, total: int = 0, occupied: int = 0) -> None:
+    record_occupancy_changes({(building, floor): (total, occupied)})
@@ -32,5 +32,32 @@ class UpdateApartmentSerializer(serializers.ModelSerializer):
         read_only_fields = ["unit_number", "building", "floor" ]
 
 
-
-
+class ApartmentImportSerializer(serializers.Serializer):
+    # Validates one row of a bulk import without touching the database:
+    # unit_number uniqueness is checked once per batch by the importer.
+    unit_number = serializers.CharField(max_length=10)
+    building = serializers.CharField(max_length=50)
+    # Bounded by the PositiveIntegerField column so out-of-range floors are
+    # reported as row errors instead of failing the INSERT.
+    floor = serializers.IntegerField(min_value=0, max_value=2147483647)
+
+
+class ApartmentTenantPairSerializer(serializers.Serializer):
+    apartment = serializers.UUIDField()
+    tenant = serializers.UUIDField(required=False, allow_null=True, default=None)
+
+
+class BulkAssignmentSerializer(serializers.Serializer):
+    class Action:
+        ASSIGN = "assign"
+        RELEASE = "release"
+
+    action = serializers.ChoiceField(choices=[Action.ASSIGN, Action.RELEASE])
+    pairs = ApartmentTenantPairSerializer(many=True, allow_empty=False, max_length=1000)
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs["action"] == self.Action.ASSIGN and any(
+            pair["tenant"] is None for pair in attrs["pairs"]
+        ):
+            raise serializers.ValidationError({"pairs": ["Every pair needs a tenant to assign."]})
+        return attrs
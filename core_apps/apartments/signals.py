@@ -0,0 +1,16 @@
+from typing import Any, Type
+
+from django.db.models.base import Model
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from backend.settings.base import AUTH_USER_MODEL
+
+from .occupancy import invalidate_occupancy_summary
+
+
+# Deleting a tenant sets its apartments' tenant to NULL in the database,
+# without any occupancy delta
+@receiver(post_delete, sender=AUTH_USER_MODEL)
+def invalidate_occupancy_on_user_delete(sender: Type[Model], instance: Model, **kwargs: Any) -> None:
+    invalidate_occupancy_summary()
@@ -0,0 +1,275 @@
+import io
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core_apps.profiles.models import Profile
+
+from .assignments import bulk_assign, bulk_release
+from .importers import ApartmentImporter, iter_csv_rows
+from .models import Apartment
+from .occupancy import (
+    get_occupancy_summary,
+    invalidate_occupancy_summary,
+    record_occupancy_change,
+)
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def make_user(name: str, **extra_fields):
+    return User.objects.create_user(
+        username=name, email=f"{name}@example.com", password="pass1234!", **extra_fields
+    )
+
+
+def occupancy() -> dict:
+    return {
+        (row["building"], row["floor"]): (row["total"], row["occupied"])
+        for row in get_occupancy_summary()
+    }
+
+
+def test_occupancy_counts_per_floor():
+    tenant = make_user("tenant")
+    Apartment.objects.create(unit_number="A1", building="A", floor=1, tenant=tenant)
+    Apartment.objects.create(unit_number="A2", building="A", floor=1)
+    Apartment.objects.create(unit_number="B1", building="B", floor=0)
+
+    assert occupancy() == {("A", 1): (2, 1), ("B", 0): (1, 0)}
+
+
+def test_occupancy_deltas_apply_on_commit(django_capture_on_commit_callbacks):
+    Apartment.objects.create(unit_number="A1", building="A", floor=1)
+    occupancy()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        record_occupancy_change("A", 1, occupied=1)
+
+    assert occupancy() == {("A", 1): (1, 1)}
+
+
+def test_occupancy_new_floor_rebuilds(django_capture_on_commit_callbacks):
+    Apartment.objects.create(unit_number="A1", building="A", floor=1)
+    occupancy()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Apartment.objects.create(unit_number="A9", building="A", floor=9)
+        record_occupancy_change("A", 9, total=1)
+
+    assert occupancy() == {("A", 1): (1, 0), ("A", 9): (1, 0)}
+
+
+def test_invalidation_drops_every_counter(django_capture_on_commit_callbacks):
+    apartment = Apartment.objects.create(unit_number="A1", building="A", floor=1)
+    assert occupancy() == {("A", 1): (1, 0)}
+
+    # An admin edit moves the apartment without recording any delta
+    with django_capture_on_commit_callbacks(execute=True):
+        Apartment.objects.filter(pkid=apartment.pkid).update(building="B")
+        invalidate_occupancy_summary()
+
+    assert occupancy() == {("B", 1): (1, 0)}
+    assert occupancy() == {("B", 1): (1, 0)}
+
+
+def test_deleting_a_tenant_frees_its_apartment(django_capture_on_commit_callbacks):
+    tenant = make_user("tenant")
+    Apartment.objects.create(unit_number="A1", building="A", floor=1, tenant=tenant)
+    assert occupancy() == {("A", 1): (1, 1)}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        tenant.delete()
+
+    assert occupancy() == {("A", 1): (1, 0)}
+
+
+@pytest.fixture
+def admin_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(make_user("admin", is_staff=True))
+    return client
+
+
+def test_assign_only_takes_a_vacant_apartment():
+    first, second = make_user("first"), make_user("second")
+    apartment = Apartment.objects.create(unit_number="A1", building="A", floor=1)
+
+    assert Apartment.objects.filter(pkid=apartment.pkid).assign(first) == 1
+    assert Apartment.objects.filter(pkid=apartment.pkid).assign(second) == 0
+
+    apartment.refresh_from_db()
+    assert apartment.tenant == first
+
+
+def test_assign_view_reports_why_nothing_was_assigned(admin_client):
+    tenant = make_user("tenant")
+    apartment = Apartment.objects.create(unit_number="A1", building="A", floor=1)
+    url = f"/api/v1/apartments/{apartment.id}/assign/"
+
+    assert admin_client.patch(url, {"tenant": str(tenant.id)}).status_code == 200
+    response = admin_client.patch(url, {"tenant": str(make_user("other").id)})
+    assert (response.status_code, response.data["message"]) == (400, "Apartment is already assigned.")
+    response = admin_client.patch(
+        f"/api/v1/apartments/{uuid.uuid4()}/assign/", {"tenant": str(tenant.id)}
+    )
+    assert (response.status_code, response.data["message"]) == (404, "Apartment not found.")
+
+
+def test_release_rented_is_limited_to_the_given_tenant():
+    tenant, other = make_user("tenant"), make_user("other")
+    apartment = Apartment.objects.create(unit_number="A1", building="A", floor=1, tenant=tenant)
+
+    assert Apartment.release_rented(apartment.id, tenant_pkid=other.pkid) is None
+    assert Apartment.release_rented(apartment.id, tenant_pkid=tenant.pkid) == ("A", 1)
+    assert Apartment.release_rented(apartment.id) is None
+
+
+def test_release_view_lets_only_the_tenant_or_an_admin_release():
+    tenant, other = make_user("tenant"), make_user("other")
+    apartment = Apartment.objects.create(unit_number="A1", building="A", floor=1, tenant=tenant)
+    url = f"/api/v1/apartments/{apartment.id}/release/"
+    client = APIClient()
+
+    client.force_authenticate(other)
+    assert client.patch(url).status_code == 403
+    client.force_authenticate(tenant)
+    assert client.patch(url).status_code == 200
+    assert client.patch(url).status_code == 400
+    assert client.patch(f"/api/v1/apartments/{uuid.uuid4()}/release/").status_code == 404
+
+    apartment.refresh_from_db()
+    assert apartment.tenant is None
+
+
+def test_bulk_assign_reports_conflicts():
+    first, second = make_user("first"), make_user("second")
+    landlord = make_user("landlord")
+    Profile.objects.filter(user=landlord).update(occupation=Profile.Occupation.Plumber)
+    vacant = Apartment.objects.create(unit_number="A1", building="A", floor=1)
+    rented = Apartment.objects.create(unit_number="A2", building="A", floor=1, tenant=second)
+    missing = uuid.uuid4()
+
+    assigned, conflicts = bulk_assign(
+        [
+            (vacant.id, first.id),
+            (vacant.id, second.id),
+            (rented.id, first.id),
+            (missing, first.id),
+            (vacant.id, landlord.id),
+        ]
+    )
+
+    assert assigned == [{"apartment": str(vacant.id), "tenant": str(first.id)}]
+    assert [conflict["reason"] for conflict in conflicts] == [
+        "Apartment is already assigned.",
+        "Apartment is already assigned.",
+        "Apartment not found.",
+        "Tenant not found.",
+    ]
+    vacant.refresh_from_db()
+    assert vacant.tenant == first
+
+
+def test_bulk_release_checks_the_expected_tenant(django_capture_on_commit_callbacks):
+    tenant, other = make_user("tenant"), make_user("other")
+    kept = Apartment.objects.create(unit_number="A1", building="A", floor=1, tenant=tenant)
+    released = Apartment.objects.create(unit_number="A2", building="A", floor=1, tenant=tenant)
+    assert occupancy() == {("A", 1): (2, 2)}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        done, conflicts = bulk_release([(kept.id, other.id), (released.id, tenant.id)])
+
+    assert done == [{"apartment": str(released.id), "tenant": str(tenant.id)}]
+    assert [conflict["reason"] for conflict in conflicts] == ["Apartment is rented by another tenant."]
+    assert occupancy() == {("A", 1): (2, 1)}
+
+
+def csv_upload(*lines: bytes) -> io.BytesIO:
+    return io.BytesIO(b"".join(line + b"\n" for line in lines))
+
+
+def test_csv_rows_recover_after_a_bad_line():
+    rows = list(
+        iter_csv_rows(
+            csv_upload(
+                b"\xef\xbb\xbfunit_number,building,floor",
+                b"A1,A,1",
+                b"A2,\xff,2",
+                b'A3,"A,3',
+                b"A4,A,4,extra",
+                b"",
+                b"A5,A",
+            )
+        )
+    )
+
+    assert [(line, row) for line, row, error in rows if error is None] == [
+        (2, {"unit_number": "A1", "building": "A", "floor": "1"}),
+        (7, {"unit_number": "A5", "building": "A", "floor": None}),
+    ]
+    assert [line for line, _, error in rows if error is not None] == [3, 4, 5]
+
+
+def test_unreadable_csv_header_stops_the_import():
+    rows = list(iter_csv_rows(csv_upload(b'"unit_number,building', b"A1,A,1")))
+
+    assert [(line, row) for line, row, _ in rows] == [(1, None)]
+
+
+def test_import_inserts_once_per_batch():
+    lines = [f"A{number},A,{number % 2}".encode() for number in range(5)]
+    importer = ApartmentImporter(batch_size=2)
+
+    with CaptureQueriesContext(connection) as queries:
+        report = importer.run(iter_csv_rows(csv_upload(b"unit_number,building,floor", *lines)))
+
+    inserts = [query for query in queries if query["sql"].startswith("INSERT")]
+    assert len(inserts) == 3
+    assert report == {"created": 5, "failed": 0, "row_errors": [], "row_errors_truncated": False}
+    assert Apartment.objects.count() == 5
+
+
+def test_import_reports_row_errors_and_keeps_the_rest():
+    Apartment.objects.create(unit_number="A1", building="A", floor=1)
+    upload = csv_upload(
+        b"unit_number,building,floor",
+        b"A1,A,1",
+        b"A2,A,-1",
+        b"A3,A,3",
+        b"A3,A,3",
+        b"A4,A,4",
+    )
+
+    report = ApartmentImporter(batch_size=10, max_reported_errors=2).run(iter_csv_rows(upload))
+
+    assert (report["created"], report["failed"]) == (2, 3)
+    assert [error["line"] for error in report["row_errors"]] == [3, 5]
+    assert report["row_errors_truncated"]
+    assert set(Apartment.objects.values_list("unit_number", flat=True)) == {"A1", "A3", "A4"}
+
+
+def test_import_view_reads_the_upload(admin_client):
+    response = admin_client.post(
+        "/api/v1/apartments/import/",
+        data=b"unit_number,building,floor\nA1,A,1\n",
+        content_type="text/csv",
+    )
+    assert (response.status_code, response.data["created"]) == (200, 1)
+
+    response = admin_client.post(
+        "/api/v1/apartments/import/", data=b"A1;A;1", content_type="text/plain"
+    )
+    assert response.status_code == 415
@@ -1,10 +1,13 @@
 from django.urls import path, re_path
 from .views import ApartmentCreateAPIview, ApartmentDetailsView, ApartmentListAPIView, ApartmentReleaseView, \
-    ApartmentAssignView
+    ApartmentAssignView, ApartmentBulkImportAPIView, ApartmentBulkAssignmentView, ApartmentOccupancyAPIView
 
 urlpatterns = [
     path("", ApartmentCreateAPIview.as_view(), name="apartment-create"),
     path("me/", ApartmentDetailsView.as_view(), name="apartment-details"),
+    path("import/", ApartmentBulkImportAPIView.as_view(), name="apartment-bulk-import"),
+    path("assignments/", ApartmentBulkAssignmentView.as_view(), name="apartment-bulk-assignment"),
+    path("occupancy/", ApartmentOccupancyAPIView.as_view(), name="apartment-occupancy"),
     path("available/", ApartmentListAPIView.as_view(), name="apartment-non-assigned"),
     path('<uuid:apartment_id>/release/', ApartmentReleaseView.as_view(), name='apartment-release'),
     path('<uuid:apartment_id>/assign/', ApartmentAssignView.as_view(), name='apartment-assign'),
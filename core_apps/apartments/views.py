@@ -7,7 +7,10 @@ from rest_framework.views import APIView
 from core_apps.profiles.models import Profile
 from django.contrib.auth import get_user_model
 from rest_framework import generics, status
-from .serializers import ApartmentSerializer, UpdateApartmentSerializer
+from .assignments import bulk_assign, bulk_release
+from .importers import ApartmentImporter, iter_csv_rows, iter_ndjson_rows
+from .occupancy import get_occupancy_summary, record_occupancy_change
+from .serializers import ApartmentSerializer, UpdateApartmentSerializer, BulkAssignmentSerializer
 from django.utils.translation import gettext_lazy as _
 from .models import Apartment
 from rest_framework.response import Response
@@ -16,19 +19,23 @@ from core_apps.common.renderers import GenericJSONRenderer
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny  # More concise
 from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 
-from core_apps.common.pagination import StandardResultsSetPagination
+from core_apps.common.conditional import ConditionalGetMixin
+from core_apps.common.export import StreamingExportMixin
+from core_apps.common.response_cache import ResponseCacheMixin
+from core_apps.common.pagination import KeysetPagination
 
 User = get_user_model()
 # import  logging
 # logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
 
-class ApartmentListAPIView(generics.ListAPIView):
+class ApartmentListAPIView(ResponseCacheMixin, StreamingExportMixin, generics.ListAPIView):
     renderer_classes = (GenericJSONRenderer,)
     serializer_class = ApartmentSerializer
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetPagination
     permission_classes = (AllowAny,)
     object_label = "apartments"
+    cache_dependencies = [Apartment]
 
     def get_queryset(self):
         #self.pagination_class.page_size = 4
@@ -50,8 +57,75 @@ class ApartmentCreateAPIview(generics.CreateAPIView):
             return Response({"message": _("Only superusers or staff members can create apartments.")},
                             status=status.HTTP_403_FORBIDDEN)
 
+    def perform_create(self, serializer: ApartmentSerializer) -> None:
+        apartment = serializer.save()
+        record_occupancy_change(apartment.building, apartment.floor, total=1)
 
-class ApartmentDetailsView(generics.ListAPIView):
+
+class ApartmentOccupancyAPIView(APIView):
+    permission_classes = [IsAdminUser]
+    renderer_classes = (GenericJSONRenderer,)
+    object_label = "occupancy"
+
+    @swagger_auto_schema(
+        operation_summary="Taux d'occupation par immeuble et par étage",
+        operation_description=(
+            "Renvoie le nombre total d'appartements, occupés et libres, groupés par immeuble et par étage. "
+            "Les compteurs sont servis depuis le cache et mis à jour à chaque attribution, libération ou création."
+        ),
+    )
+    def get(self, request, *args, **kwargs):
+        floors = get_occupancy_summary()
+        total = sum(row["total"] for row in floors)
+        occupied = sum(row["occupied"] for row in floors)
+        return Response(
+            {"total": total, "occupied": occupied, "vacant": total - occupied, "floors": floors},
+            status=status.HTTP_200_OK
+        )
+
+
+class ApartmentBulkImportAPIView(APIView):
+    permission_classes = [IsAdminUser]
+    renderer_classes = (GenericJSONRenderer,)
+    object_label = "import"
+    batch_size = 500
+    row_readers = {
+        "text/csv": iter_csv_rows,
+        "application/x-ndjson": iter_ndjson_rows,
+        "application/jsonl": iter_ndjson_rows,
+    }
+
+    @swagger_auto_schema(
+        operation_summary="Importer des appartements en masse",
+        operation_description=(
+            "Permet à un administrateur d'importer des appartements depuis un corps de requête "
+            "CSV (text/csv, avec en-tête unit_number,building,floor) ou NDJSON "
+            "(application/x-ndjson). Le fichier est lu ligne par ligne et inséré par lots."
+        ),
+    )
+    def post(self, request, *args, **kwargs):
+        content_type = request.content_type.split(";")[0].strip().lower()
+        read_rows = self.row_readers.get(content_type)
+        if read_rows is None:
+            return Response(
+                {"message": "Upload must be sent as text/csv or application/x-ndjson."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+
+        # The body is read straight from the request stream, never through request.data,
+        # so the upload is not buffered in memory.
+        if request.stream is None:
+            return Response(
+                {"message": "The upload is empty."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        importer = ApartmentImporter(batch_size=self.batch_size)
+        report = importer.run(read_rows(request.stream))
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class ApartmentDetailsView(ConditionalGetMixin, generics.ListAPIView):
     renderer_classes = (GenericJSONRenderer,)
     serializer_class = ApartmentSerializer
     object_label = "apartments"
@@ -131,38 +205,36 @@ class ApartmentReleaseView(APIView):
 
     def patch(self, request, *args, **kwargs):
         apartment_id = kwargs.get('apartment_id')
+        is_admin = request.user.is_superuser or request.user.is_staff
 
-        try:
-            # Fetch the apartment with its related tenant
-            apartment = Apartment.objects.select_related('tenant').get(id=apartment_id)
-
-            # Check if the apartment is actually rented
-            if apartment.tenant is None:
+        # Release the apartment in a single conditional UPDATE, non-admin users
+        # may only release the apartment they still rent
+        released = Apartment.release_rented(
+            apartment_id, tenant_pkid=None if is_admin else request.user.pkid
+        )
+        if released is None:
+            # Nothing was released, read the row once to tell the caller why
+            tenant = Apartment.objects.filter(id=apartment_id).values_list("tenant", flat=True)
+            if not tenant:
+                return Response(
+                    {"message": "Apartment not found."},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            if tenant[0] is None:
                 return Response(
                     {"message": "Apartment is not currently rented."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            # Check user permissions
-            if not (request.user.is_superuser or
-                    request.user.is_staff or
-                    request.user == apartment.tenant):
-                raise PermissionDenied(
-                    "Only admin members or the apartment tenant can release apartments."
-                )
-            # Release the apartment
-            apartment.tenant = None
-            apartment.save()
-
-            return Response(
-                {"message": "Apartment successfully released."},
-                status=status.HTTP_200_OK
+            raise PermissionDenied(
+                "Only admin members or the apartment tenant can release apartments."
             )
 
-        except Apartment.DoesNotExist:
-            return Response(
-                {"message": "Apartment not found."},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        building, floor = released
+        record_occupancy_change(building, floor, occupied=-1)
+        return Response(
+            {"message": "Apartment successfully released."},
+            status=status.HTTP_200_OK
+        )
 
 
 class ApartmentAssignView(APIView):
@@ -246,33 +318,57 @@ class ApartmentAssignView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Validate apartment
+        # Assign the apartment only if it is still vacant, in a single conditional UPDATE
         apartment_id = kwargs.get("apartment_id")
-        try:
-            apartment = Apartment.objects.select_related("tenant").get(id=apartment_id)
-
-            # Check apartment availability
-            if apartment.tenant is not None:
+        if not Apartment.objects.filter(id=apartment_id).assign(tenant):
+            if Apartment.objects.filter(id=apartment_id).exists():
                 return Response(
                     {"message": "Apartment is already assigned."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-
-            # Assign apartment
-            apartment.tenant = tenant
-            apartment.save()
-
-            # Serialize the updated apartment
-            serializer = self.serializer_class(apartment)
-
-            return Response(
-                serializer.data,
-                status=status.HTTP_200_OK
-            )
-
-        except Apartment.DoesNotExist:
             return Response(
                 {"message": "Apartment not found."},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        # Serialize the updated apartment
+        apartment = Apartment.objects.select_related("tenant").get(id=apartment_id)
+        record_occupancy_change(apartment.building, apartment.floor, occupied=1)
+        serializer = self.serializer_class(apartment)
+
+        return Response(
+            serializer.data,
+            status=status.HTTP_200_OK
+        )
+
+
+class ApartmentBulkAssignmentView(APIView):
+    permission_classes = [IsAdminUser]
+    renderer_classes = (GenericJSONRenderer,)
+    object_label = "assignment"
+
+    @swagger_auto_schema(
+        operation_summary="Attribuer ou libérer des appartements en masse",
+        operation_description=(
+            "Permet à un administrateur d'attribuer (action=assign) ou de libérer (action=release) "
+            "plusieurs couples (appartement, locataire) dans une seule transaction. Les couples "
+            "qui ont perdu la course sont renvoyés dans conflicts."
+        ),
+        request_body=BulkAssignmentSerializer,
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = BulkAssignmentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        action = serializer.validated_data["action"]
+        pairs = [(pair["apartment"], pair["tenant"]) for pair in serializer.validated_data["pairs"]]
+
+        if action == BulkAssignmentSerializer.Action.ASSIGN:
+            done, conflicts = bulk_assign(pairs)
+        else:
+            done, conflicts = bulk_release(pairs)
+
+        return Response(
+            {"action": action, "applied": done, "conflicts": conflicts},
+            status=status.HTTP_200_OK
+        )
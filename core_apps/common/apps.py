@@ -6,3 +6,8 @@ class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.common"
     verbose_name = _("Manage shared contents")
+
+    def ready(self):
+        from .signals import connect_response_cache_receivers
+
+        connect_response_cache_receivers()
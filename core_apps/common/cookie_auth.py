@@ -1,15 +1,33 @@
 import logging
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.request import Request
 from rest_framework_simplejwt.authentication import JWTAuthentication, AuthUser
-from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
 # Configuration du logger pour cette classe
 logger = logging.getLogger(__name__)
 
 
+def cached_user_key(user_id: Any) -> str:
+    # user_id is the token claim, i.e. the user's SIMPLE_JWT["USER_ID_FIELD"]
+    return f"auth:user:{user_id}"
+
+
+def forget_cached_user(user_id: Any) -> None:
+    """
+    Drops the cached authentication of a user once the current transaction
+    commits, so the next request reloads what was written.
+    """
+    transaction.on_commit(lambda: cache.delete(cached_user_key(user_id)))
+
+
 class CookieAuthentication(JWTAuthentication):
     def authenticate(self, request: Request) -> Optional[Tuple[AuthUser, Token]]:
         # Tente d'obtenir le header d'authentification
@@ -37,4 +55,44 @@ class CookieAuthentication(JWTAuthentication):
                 logger.error(f"Token validation error: {str(e)}")
 
         # Si aucun token valide n'a été trouvé, retourne None
-        return None
\ No newline at end of file
+        return None
+
+    def get_user(self, validated_token: Token) -> AuthUser:
+        """
+        The token's user with its profile, from the cache when loaded less
+        than AUTH_USER_CACHE_TTL seconds ago, otherwise with one query.
+
+        Entries are dropped by forget_cached_user() when the user or the
+        profile is written; the TTL bounds what is missed, e.g. queryset
+        updates. Token checks run on every request like simplejwt's.
+        """
+        if not settings.AUTH_USER_CACHE_TTL:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        key = cached_user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related("profile").get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            cache.set(key, user, settings.AUTH_USER_CACHE_TTL)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                "The user's password has been changed.", code="password_changed"
+            )
+
+        return user
\ No newline at end of file
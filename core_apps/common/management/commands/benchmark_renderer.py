@@ -0,0 +1,100 @@
+import json
+import random
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from core_apps.common.renderers import GenericJSONRenderer
+
+
+def legacy_render(data, status_code, object_label):
+    # The envelope as rendered before: a wrapping dict through json.dumps
+    # (with DRF's encoder, without it UUIDs and datetimes do not encode)
+    return json.dumps({"status_code": status_code, object_label: data}, cls=JSONEncoder).encode("utf-8")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks GenericJSONRenderer on synthetic pages of issue-like items: "
+        "the previous envelope rendering against each JSON backend, for every "
+        "--sizes page size. Nothing is read from or written to the database."
+    )
+
+    backends = {
+        "json": "core_apps.common.renderers.json_dumps",
+        "orjson": "core_apps.common.renderers.orjson_dumps",
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000])
+        parser.add_argument(
+            "--duration", type=float, default=2.0, help="Seconds spent rendering per case."
+        )
+        parser.add_argument("--seed", type=int, default=42)
+
+    def make_page(self, rng: random.Random, size: int) -> ReturnList:
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return ReturnList(
+            [
+                OrderedDict(
+                    id=uuid.UUID(int=rng.getrandbits(128)),
+                    apartment_unit=f"{rng.randint(1, 40)}{rng.choice('ABCD')}",
+                    reported_by="Jean Dupont",
+                    assigned_to=rng.choice([None, "Marie Curie"]),
+                    title="Fuite d'eau sous l'évier",
+                    description="La canalisation fuit depuis hier soir. " * rng.randint(1, 5),
+                    status=rng.choice(["reported", "in_progress", "resolved"]),
+                    priority=rng.choice(["low", "medium", "high"]),
+                    view_count=rng.randint(0, 5_000),
+                    cost=Decimal(rng.randint(0, 100_000)) / 100,
+                    created_at=created + timedelta(seconds=rng.randint(0, 10**7), microseconds=rng.randint(0, 10**6)),
+                    tags=["plumbing", "kitchen"],
+                )
+                for _ in range(size)
+            ],
+            serializer=None,
+        )
+
+    def time_case(self, render, duration: float):
+        calls, started = 0, time.perf_counter()
+        while (elapsed := time.perf_counter() - started) < duration:
+            render()
+            calls += 1
+        return calls / elapsed
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        renderer = GenericJSONRenderer()
+        context = {"view": SimpleNamespace(object_label="issues"), "response": Response(status=200)}
+
+        for size in options["sizes"]:
+            data = self.make_page(rng, size)
+            legacy = legacy_render(data, 200, "issues")
+            baseline = self.time_case(lambda: legacy_render(data, 200, "issues"), options["duration"])
+            self.stdout.write(f"{size:,} items, {len(legacy) / 1024:,.0f} KiB")
+            self.stdout.write(f"  legacy envelope: {baseline:,.0f} pages/s")
+
+            for name, path in self.backends.items():
+                backend = import_string(path)
+
+                def render(backend=backend, data=data) -> bytes:
+                    return b'{"status_code":%d,"issues":%s}' % (200, backend(data))
+
+                rendered = render()
+                if json.loads(rendered) != json.loads(legacy):
+                    self.stderr.write(f"  {name}: output differs from the legacy rendering")
+                rate = self.time_case(render, options["duration"])
+                self.stdout.write(f"  {name}: {rate:,.0f} pages/s ({rate / baseline:.1f}x)")
+
+            # The renderer itself, with the configured backend
+            rate = self.time_case(lambda: renderer.render(data, renderer_context=context), options["duration"])
+            self.stdout.write(f"  GenericJSONRenderer: {rate:,.0f} pages/s ({rate / baseline:.1f}x)")
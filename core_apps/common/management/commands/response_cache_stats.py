@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from core_apps.common.response_cache import ResponseCacheMixin, iter_view_classes, read_stats
+
+
+def cached_views(patterns):
+    for view_class in iter_view_classes(patterns):
+        if issubclass(view_class, ResponseCacheMixin):
+            yield view_class
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the response cache counters: hits, misses and hit rate of every "
+        "cached view, and invalidations of the models they depend on."
+    )
+
+    def handle(self, *args, **options):
+        views = {view.response_cache_name(): view for view in cached_views(get_resolver().url_patterns)}
+        hits = read_stats("hits", views)
+        misses = read_stats("misses", views)
+
+        for name in sorted(views):
+            total = hits[name] + misses[name]
+            rate = f"{hits[name] / total:.1%}" if total else "-"
+            self.stdout.write(f"{name}: {hits[name]:,} hit(s), {misses[name]:,} miss(es), hit rate {rate}")
+
+        labels = sorted(
+            {model._meta.label_lower for view in views.values() for model in view.cache_dependencies}
+        )
+        for label, invalidations in read_stats("invalidations", labels).items():
+            self.stdout.write(f"{label}: {invalidations:,} invalidation(s)")
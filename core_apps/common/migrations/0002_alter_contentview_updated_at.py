@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="contentview",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,22 +1,84 @@
 import uuid
+from typing import Any
 from django.db import models, IntegrityError
+from django.db.models import DEFERRED
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+class TimeStampedQuerySet(models.QuerySet):
+    def update(self, **kwargs) -> int:
+        # Queryset updates skip auto_now, updated_at is set here instead
+        kwargs.setdefault("updated_at", timezone.now())
+        return super().update(**kwargs)
+
+
 class TimeStampedModel(models.Model):
     pkid = models.BigAutoField(primary_key=True, editable=False)
     id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TimeStampedQuerySet.as_manager()
 
     class Meta:
         abstract = True  # Tell django this class must not be stored in database
         ordering = ["-created_at", "-updated_at"]
 
+    # Field change tracking: the values loaded from the database are kept so
+    # save() overrides can tell what changed without re-reading the row.
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not DEFERRED
+        }
+        return instance
+
+    def _snapshot_loaded_values(self) -> None:
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred
+        }
+
+    def get_initial_value(self, field_name: str) -> Any:
+        # Value of the field when the instance was loaded or last saved
+        attname = self._meta.get_field(field_name).attname
+        return getattr(self, "_loaded_values", {}).get(attname)
+
+    def has_changed(self, field_name: str) -> bool:
+        attname = self._meta.get_field(field_name).attname
+        loaded_values = getattr(self, "_loaded_values", None)
+        if loaded_values is None or attname not in loaded_values:
+            # Unsaved instance or field not loaded: assume it changed
+            return True
+        return loaded_values[attname] != getattr(self, attname)
+
+    def get_changed_fields(self) -> list[str]:
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if self.has_changed(field.name)
+        ]
+
+    def save(self, *args, **kwargs) -> None:
+        update_fields = kwargs.get("update_fields")
+        if update_fields and "updated_at" not in update_fields:
+            # auto_now only reaches the row when the column is written
+            kwargs["update_fields"] = [*update_fields, "updated_at"]
+        super().save(*args, **kwargs)
+        self._snapshot_loaded_values()
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs) -> None:
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot_loaded_values()
+
 
 class ContentView(TimeStampedModel):
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, verbose_name=_('Content Type'))
@@ -0,0 +1,102 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import get_template
+from django.utils.html import strip_tags
+
+logger = logging.getLogger(__name__)
+
+# A builder loads the objects named in the payload and returns the subject,
+# the recipients and the template context, or None when there is nothing to send.
+Builder = Callable[..., Optional[Tuple[str, List[str], dict]]]
+
+_registry: Dict[str, Tuple[str, Builder]] = {}
+
+
+def notification(name: str, template_name: str) -> Callable[[Builder], Builder]:
+    """
+    Registers an email notification under `name`, rendered with `template_name`.
+    """
+
+    def decorator(build: Builder) -> Builder:
+        _registry[name] = (template_name, build)
+        return build
+
+    return decorator
+
+
+def enqueue_notifications(items: Iterable[Tuple[str, dict]]) -> None:
+    """
+    Queues notifications as small JSON payloads (notification name and object
+    ids) once the current transaction commits. Nothing is rendered here, the
+    send_notifications Celery task renders and sends the whole batch.
+    """
+    from .tasks import send_notifications
+
+    payloads = [{"name": name, "params": params} for name, params in items]
+    if payloads:
+        transaction.on_commit(lambda: send_notifications.delay(payloads))
+
+
+def enqueue_notification(name: str, **params) -> None:
+    enqueue_notifications([(name, params)])
+
+
+def build_message(payload: dict) -> Optional[EmailMultiAlternatives]:
+    template_name, build = _registry[payload["name"]]
+    built = build(**payload["params"])
+    if built is None:
+        return None
+
+    subject, recipients, context = built
+    context.setdefault("site_name", settings.SITE_NAME)
+    # get_template goes through the cached template loader: each template is
+    # compiled once per worker process
+    html_email = get_template(template_name).render(context)
+    email = EmailMultiAlternatives(
+        subject, strip_tags(html_email), settings.DEFAULT_FROM_EMAIL, recipients
+    )
+    email.attach_alternative(html_email, "text/html")
+    return email
+
+
+def send_notification_batch(payloads: List[dict]) -> Tuple[int, List[dict]]:
+    """
+    Renders every payload and sends the messages one by one over a single
+    connection. Returns the number of messages sent and the payloads whose
+    message could not be delivered, so only those are retried.
+    """
+    messages = []
+    for payload in payloads:
+        try:
+            email = build_message(payload)
+        except Exception as e:
+            logger.error(f"Failed to build the '{payload.get('name')}' notification: {e}", exc_info=True)
+            continue
+        if email is not None:
+            messages.append((payload, email))
+
+    if not messages:
+        return 0, []
+
+    sent, failed = 0, []
+    connection = get_connection(settings.NOTIFICATION_EMAIL_BACKEND)
+    try:
+        connection.open()
+    except OSError as e:
+        logger.warning(f"Could not connect to send {len(messages)} notification(s): {e}")
+        return 0, [payload for payload, _ in messages]
+
+    try:
+        for payload, email in messages:
+            try:
+                sent += connection.send_messages([email]) or 0
+            except OSError as e:
+                logger.warning(f"Failed to send the '{payload['name']}' notification: {e}")
+                failed.append(payload)
+    finally:
+        connection.close()
+    return sent, failed
@@ -1,7 +1,228 @@
-from rest_framework.pagination import PageNumberPagination
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from urllib import parse
+
+from django.db import connections
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     # todo make it 9
     page_size = 3
     page_size_query_param = "page_size"
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+
+
+def get_approximate_count(queryset) -> int:
+    """
+    Returns the planner's row estimate for the queryset instead of running a
+    full COUNT(*). Falls back to an exact count on non-PostgreSQL databases.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (created_at, pkid), newest first.
+
+    Every TimeStampedModel carries both columns, so any list view can switch
+    to it with `pagination_class = KeysetPagination`. Pages are fetched with
+    an index range scan from the cursor position: there is no OFFSET and no
+    COUNT(*). Clients may opt in to a planner-estimated total with
+    `?include_total=true`.
+    """
+
+    page_size = 9
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    total_query_param = "include_total"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.approximate_count = None
+
+        if request.query_params.get(self.total_query_param, "").lower() in ("1", "true"):
+            self.approximate_count = get_approximate_count(queryset)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = cursor is not None and cursor["reverse"]
+
+        if cursor is not None:
+            created_at, pkid = cursor["created_at"], cursor["pkid"]
+            if self.reverse:
+                # Walking back towards newer rows: (created_at, pkid) > cursor
+                queryset = queryset.filter(created_at__gte=created_at).exclude(
+                    created_at=created_at, pkid__lte=pkid
+                )
+            else:
+                # (created_at, pkid) < cursor, written so the planner keeps a range scan
+                queryset = queryset.filter(created_at__lte=created_at).exclude(
+                    created_at=created_at, pkid__gte=pkid
+                )
+
+        if self.reverse:
+            queryset = queryset.order_by("created_at", "pkid")
+        else:
+            queryset = queryset.order_by("-created_at", "-pkid")
+
+        # Fetch one extra row to know whether another page follows
+        results = list(queryset[: self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_following
+        else:
+            self.has_next, self.has_previous = has_following, cursor is not None
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
+        if self.approximate_count is not None:
+            payload["approximate_count"] = self.approximate_count
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+                "approximate_count": {"type": "integer"},
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        tokens = {"t": instance.created_at.isoformat(), "p": instance.pkid}
+        if reverse:
+            tokens["r"] = "1"
+        encoded = b64encode(parse.urlencode(tokens, doseq=True).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request) -> dict | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            created_at = parse_datetime(tokens["t"][0])
+            pkid = int(tokens["p"][0])
+            reverse = tokens.get("r", ["0"])[0] == "1"
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return {"created_at": created_at, "pkid": pkid, "reverse": reverse}
+
+
+class RankedKeysetPagination(KeysetPagination):
+    """
+    Cursor pagination keyed on (rank, pkid), best match first.
+
+    For querysets annotated with a relevance `rank` (full-text search): the
+    cursor carries the rank of the last row served, so each page only reads
+    the rows ranked below it. Rankings have no stable order in the other
+    direction, so pages only link forward.
+    """
+
+    rank_field = "rank"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.approximate_count = None
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            rank, pkid = cursor["rank"], cursor["pkid"]
+            queryset = queryset.filter(**{f"{self.rank_field}__lte": rank}).exclude(
+                **{self.rank_field: rank, "pkid__gte": pkid}
+            )
+
+        results = list(queryset.order_by(f"-{self.rank_field}", "-pkid")[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        self.has_next, self.has_previous = len(results) > self.page_size, False
+        return self.page
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        # repr() round-trips the float, so the next page resumes exactly here
+        tokens = {"k": repr(getattr(instance, self.rank_field)), "p": instance.pkid}
+        encoded = b64encode(parse.urlencode(tokens).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request) -> dict | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            rank = float(tokens["k"][0])
+            pkid = int(tokens["p"][0])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return {"rank": rank, "pkid": pkid}
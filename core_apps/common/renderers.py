@@ -1,7 +1,94 @@
 import json
+import math
+from decimal import Decimal
+from functools import lru_cache
 from typing import Any, Optional, Union
+from django.conf import settings
+from django.utils.module_loading import import_string
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+# Un seul encodeur DRF, sa méthode default() sert aussi de repli à orjson
+drf_encoder = JSONEncoder()
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Encodage de référence : json de la bibliothèque standard avec l'encodeur
+    et les options du JSONRenderer de DRF.
+    """
+    return json.dumps(
+        data,
+        cls=JSONEncoder,
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=(",", ":") if api_settings.COMPACT_JSON else (", ", ": "),
+    ).encode("utf-8")
+
+
+def has_non_finite_number(value: Any) -> bool:
+    # NaN et infinis, qu'orjson écrit null alors que json les refuse (STRICT_JSON)
+    if type(value) is float:
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        items = value.values()
+    elif isinstance(value, (list, tuple)):
+        items = value
+    elif isinstance(value, (float, Decimal)):
+        return not math.isfinite(value) if isinstance(value, float) else not value.is_finite()
+    else:
+        return False
+    for item in items:
+        # Chaînes, entiers et None forment l'essentiel des pages : sautés sans appel
+        kind = type(item)
+        if kind is str or kind is int or item is None:
+            continue
+        if has_non_finite_number(item):
+            return True
+    return False
+
+
+def orjson_dumps(data: Any) -> bytes:
+    """
+    Encodage rapide avec orjson. Le JSON produit se décode comme celui de
+    json_dumps() mais n'est pas identique octet par octet : orjson écrit les
+    flottants sous leur forme la plus courte (1e16 et non 1e+16).
+
+    Les dates passent par l'encodeur DRF (millisecondes, suffixe "Z"), comme
+    tout type qu'orjson ne connaît pas (Decimal, chaînes paresseuses...).
+    On revient à json_dumps() sans orjson, pour ce qu'il refuse (entiers de
+    plus de 64 bits), pour les NaN et infinis (orjson les écrirait null) et
+    quand les réglages de DRF demandent un JSON non compact ou échappé en ASCII.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json_dumps(data)
+
+    if not (api_settings.COMPACT_JSON and api_settings.UNICODE_JSON):
+        return json_dumps(data)
+
+    try:
+        content = orjson.dumps(
+            data,
+            default=drf_encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+    except orjson.JSONEncodeError:
+        return json_dumps(data)
+
+    # Un nombre non fini ne peut donner que null, le contenu n'est parcouru que dans ce cas
+    if b"null" in content and has_non_finite_number(data):
+        return json_dumps(data)
+    return content
+
+
+@lru_cache(maxsize=None)
+def get_json_backend():
+    return import_string(settings.JSON_RENDERER_BACKEND)
+
 
 class GenericJSONRenderer(JSONRenderer):
     charset = "utf-8"  # Définit l'encodage par défaut
@@ -14,6 +101,10 @@ class GenericJSONRenderer(JSONRenderer):
         if renderer_context is None:
             renderer_context = {}
 
+        # Pas de contenu (ex. 204), comme le JSONRenderer de DRF
+        if data is None:
+            return b""
+
         # Récupère la vue associée et son label d'objet personnalisé, si défini
         view = renderer_context.get('view')
         object_label = getattr(view, 'object_label', self.object_label)
@@ -27,15 +118,24 @@ class GenericJSONRenderer(JSONRenderer):
         # Extrait le code de statut
         status_code = response.status_code
         # Vérifie la présence d'erreurs dans les données
-        errors = data.get("errors")
+        errors = data.get("errors") if isinstance(data, dict) else None
 
         if errors is not None:
             # Si des erreurs sont présentes, retourne un format JSON standard
             # incluant le code de statut et les erreurs
             return super().render({"status_code": status_code, "errors": errors})
 
-        # Construction et encodage de la réponse JSON personnalisée
-        return json.dumps({
-            "status_code": status_code,
-            object_label: data
-        }).encode(self.charset)
\ No newline at end of file
+        # Indentation demandée par le client : rendu standard de DRF
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(
+                {"status_code": status_code, object_label: data},
+                accepted_media_type,
+                renderer_context,
+            )
+
+        # L'enveloppe est écrite directement en octets, seul le contenu est encodé
+        return b'{"status_code":%d,%s:%s}' % (
+            status_code,
+            json_dumps(str(object_label)),
+            get_json_backend()(data),
+        )
@@ -0,0 +1,177 @@
+import hashlib
+import time
+from typing import Iterable, Iterator, List, Optional, Set, Type
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.http import HttpResponse
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.response import Response
+
+PREFIX = "response_cache"
+
+
+def generation_key(label: str) -> str:
+    return f"{PREFIX}:generation:{label}"
+
+
+def stats_key(kind: str, name: str) -> str:
+    return f"{PREFIX}:stats:{kind}:{name}"
+
+
+def count(kind: str, name: str) -> None:
+    key = stats_key(kind, name)
+    if not cache.add(key, 1, timeout=None):
+        cache.incr(key)
+
+
+def read_stats(kind: str, names: Iterable[str]) -> dict:
+    names = list(names)
+    found = cache.get_many([stats_key(kind, name) for name in names])
+    return {name: found.get(stats_key(kind, name), 0) for name in names}
+
+
+def get_generations(labels: List[str]) -> List[int]:
+    """
+    Current generation of each model label. A missing counter (never set or
+    evicted) starts from the clock, so it never takes a value that entries
+    cached before the eviction were keyed with.
+    """
+    keys = [generation_key(label) for label in labels]
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        generations.update(cache.get_many(missing))
+    return [generations[key] for key in keys]
+
+
+class GenerationBump:
+    """
+    on_commit callback bumping the generation of the labels collected during
+    a transaction, each of them once however many rows were written.
+    """
+
+    def __init__(self) -> None:
+        self.labels = set()
+
+    def __call__(self) -> None:
+        for label in sorted(self.labels):
+            try:
+                cache.incr(generation_key(label))
+            except ValueError:
+                # No counter, no response was cached against it
+                continue
+            count("invalidations", label)
+
+
+def invalidate_responses(*model_classes: Type[models.Model]) -> None:
+    """
+    Retires every cached response depending on `model_classes` once the
+    current transaction commits. Saves and deletes of the models views
+    depend on call it through signals, queryset writes (update(),
+    bulk_create(), raw SQL) must call it.
+    """
+    labels = {model._meta.label_lower for model in model_classes}
+
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        # Join the callback already registered by this transaction, if any. A
+        # savepoint rollback drops the callbacks registered inside it, the
+        # next write then registers a new one.
+        for _, callback, *_ in connection.run_on_commit:
+            if isinstance(callback, GenerationBump):
+                callback.labels |= labels
+                return
+
+    bump = GenerationBump()
+    bump.labels |= labels
+    transaction.on_commit(bump)
+
+
+def iter_view_classes(patterns) -> Iterator[type]:
+    # Class-based views of a URLconf, included URLconfs too
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_view_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is not None:
+                yield view_class
+
+
+def cached_models() -> Set[Type[models.Model]]:
+    """
+    Models a routed view caches its responses or ETags against.
+    """
+    return {
+        model
+        for view_class in iter_view_classes(get_resolver().url_patterns)
+        for model in [
+            *getattr(view_class, "cache_dependencies", []),
+            *getattr(view_class, "etag_dependencies", []),
+        ]
+    }
+
+
+class ResponseCacheMixin:
+    """
+    Caches the rendered JSON of a read view, keyed on the view, the path and
+    query string, the user when `cache_per_user` is set, and the generation
+    of every model of `cache_dependencies`.
+
+    Writing one of those models bumps its generation, which makes every
+    entry keyed on the previous one unreachable; they expire after
+    `cache_timeout`. Responses carry an X-Cache header, hits and misses are
+    counted per view (see the response_cache_stats command).
+    """
+
+    cache_dependencies: List[Type[models.Model]] = []
+    cache_per_user = False
+    cache_timeout = 300
+
+    @classmethod
+    def response_cache_name(cls) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    def get_response_cache_key(self, request) -> Optional[str]:
+        # Exports and the browsable API are not cached
+        if request.accepted_renderer.format != "json":
+            return None
+
+        labels = sorted(model._meta.label_lower for model in self.cache_dependencies)
+        generations = ".".join(str(generation) for generation in get_generations(labels))
+        user = request.user.pk if self.cache_per_user else "*"
+        query = "&".join(
+            sorted(f"{key}={value}" for key, values in request.query_params.lists() for value in values)
+        )
+        digest = hashlib.md5(f"{request.path}?{query}".encode("utf-8")).hexdigest()
+        return f"{PREFIX}:{self.response_cache_name()}:{generations}:{user}:{digest}"
+
+    def get(self, request, *args, **kwargs):
+        self.response_cache_key = self.get_response_cache_key(request)
+        if self.response_cache_key is None:
+            return super().get(request, *args, **kwargs)
+
+        cached = cache.get(self.response_cache_key)
+        if cached is not None:
+            count("hits", self.response_cache_name())
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Cache"] = "HIT"
+            return response
+
+        count("misses", self.response_cache_name())
+        return super().get(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, "response_cache_key", None)
+        if key is not None and isinstance(response, Response) and response.status_code == 200:
+            response["X-Cache"] = "MISS"
+            timeout = self.cache_timeout
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, (rendered.content, rendered["Content-Type"]), timeout)
+            )
+        return response
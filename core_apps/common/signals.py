@@ -0,0 +1,18 @@
+from typing import Any, Type
+
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_save
+
+from .response_cache import cached_models, invalidate_responses
+
+
+def invalidate_responses_on_write(sender: Type[Model], **kwargs: Any) -> None:
+    invalidate_responses(sender)
+
+
+def connect_response_cache_receivers() -> None:
+    # Only models some view depends on: a post_delete receiver turns off fast
+    # deletes of its sender, every other model keeps them
+    for model in cached_models():
+        post_save.connect(invalidate_responses_on_write, sender=model, dispatch_uid="response_cache")
+        post_delete.connect(invalidate_responses_on_write, sender=model, dispatch_uid="response_cache")
@@ -0,0 +1,32 @@
+import logging
+
+from celery import shared_task
+from celery.exceptions import MaxRetriesExceededError
+from celery.utils.time import get_exponential_backoff_interval
+
+from .notifications import send_notification_batch
+from .view_buffer import flush_view_buffer, refresh_view_counts
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="flush_content_views")
+def flush_content_views() -> int:
+    touched = flush_view_buffer()
+    refresh_view_counts(touched)
+    return sum(len(object_ids) for object_ids in touched.values())
+
+
+@shared_task(name="send_notifications", bind=True, max_retries=3)
+def send_notifications(self, payloads: list) -> int:
+    sent, failed = send_notification_batch(payloads)
+    if failed:
+        # Only the undelivered messages are sent again
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=600, full_jitter=True
+        )
+        try:
+            raise self.retry(args=[failed], countdown=countdown)
+        except MaxRetriesExceededError:
+            logger.error(f"Gave up sending {len(failed)} notification(s)")
+    return sent
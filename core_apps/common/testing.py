@@ -0,0 +1,37 @@
+from contextlib import contextmanager
+from typing import Iterator, Type
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_max_queries(budget: int, using: str = "default") -> Iterator[CaptureQueriesContext]:
+    """
+    Fails when the block runs more than `budget` queries, listing them all.
+
+        with assert_max_queries(3):
+            client.get("/api/v1/profiles/?page_size=100")
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    executed = len(context.captured_queries)
+    if executed > budget:
+        queries = "\n".join(
+            f"{number}. {query['sql']}" for number, query in enumerate(context.captured_queries, start=1)
+        )
+        raise QueryBudgetExceeded(f"{executed} queries executed, budget is {budget}:\n{queries}")
+
+
+def assert_within_query_budget(view_class: Type, using: str = "default"):
+    """
+    Same as assert_max_queries, with the `query_budget` declared by a view.
+    Requests should be authenticated with force_authenticate, the budget does
+    not account for authentication.
+    """
+    return assert_max_queries(view_class.query_budget, using=using)
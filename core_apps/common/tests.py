@@ -0,0 +1,319 @@
+import csv
+import json
+from base64 import b64encode
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core_apps.apartments.models import Apartment
+from core_apps.apartments.views import ApartmentListAPIView
+from core_apps.issues.models import Issue
+
+from .export import CSVRenderer, NDJSONRenderer
+from .models import ContentView
+from .pagination import KeysetPagination, RankedKeysetPagination
+from .tasks import flush_content_views
+from .throttling import AnonSlidingWindowThrottle, LocalThrottleStore, get_throttle_store
+from .view_buffer import LocalViewBuffer, get_view_buffer, write_views
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+def make_user(name: str, **extra_fields):
+    return User.objects.create_user(
+        username=name, email=f"{name}@example.com", password="pass1234!", **extra_fields
+    )
+
+
+@pytest.fixture
+def view_buffer(settings) -> LocalViewBuffer:
+    settings.REDIS_URL = None
+    get_view_buffer.cache_clear()
+    yield get_view_buffer()
+    get_view_buffer.cache_clear()
+
+
+@pytest.fixture
+def issue() -> Issue:
+    reporter = make_user("reporter")
+    apartment = Apartment.objects.create(unit_number="A1", building="A", floor=1, tenant=reporter)
+    return Issue.objects.create(
+        apartment=apartment, reported_by=reporter, title="Leak", description="Kitchen sink"
+    )
+
+
+def view_issue(issue: Issue, ip: str = "10.0.0.1"):
+    client = APIClient()
+    client.force_authenticate(issue.reported_by)
+    response = client.get(f"/api/v1/issues/{issue.id}/detail/", REMOTE_ADDR=ip)
+    assert response.status_code == 200
+
+
+def test_issue_view_is_buffered_without_writing(view_buffer, issue):
+    view_issue(issue)
+
+    assert not ContentView.objects.exists()
+    assert [json.loads(event)["object_id"] for event in view_buffer.events] == [issue.pkid]
+
+
+def test_flush_writes_buffered_views_and_refreshes_view_count(view_buffer, issue):
+    view_issue(issue, "10.0.0.1")
+    view_issue(issue, "10.0.0.1")
+    view_issue(issue, "10.0.0.2")
+
+    assert flush_content_views() == 1
+
+    assert not view_buffer.events
+    assert ContentView.objects.filter(object_id=issue.pkid).count() == 2
+    issue.refresh_from_db()
+    assert issue.view_count == 2
+    assert flush_content_views() == 0
+
+
+def test_write_views_updates_last_viewed_on_conflict(issue):
+    viewer = make_user("viewer")
+    event = {
+        "content_type": ContentType.objects.get_for_model(Issue).pk,
+        "object_id": issue.pkid,
+        "user": viewer.pkid,
+        "viewer_ip": "10.0.0.1",
+    }
+
+    write_views([{**event, "viewed_at": "2024-01-01T10:00:00+00:00"}])
+    write_views(
+        [
+            {**event, "viewed_at": "2024-01-03T10:00:00+00:00"},
+            {**event, "viewed_at": "2024-01-02T10:00:00+00:00"},
+        ]
+    )
+
+    view = ContentView.objects.get(object_id=issue.pkid)
+    assert view.last_viewed.isoformat() == "2024-01-03T10:00:00+00:00"
+
+
+class ThreePerMinuteThrottle(AnonSlidingWindowThrottle):
+    rate = "3/min"
+    now = 0.0
+
+    def timer(self):
+        return self.now
+
+
+@pytest.fixture
+def throttle_store(settings) -> LocalThrottleStore:
+    settings.REDIS_URL = None
+    get_throttle_store.cache_clear()
+    yield get_throttle_store()
+    get_throttle_store.cache_clear()
+
+
+def hit(throttle: ThreePerMinuteThrottle, now: float) -> bool:
+    throttle.now = now
+    request = Request(APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1"))
+    request.user = AnonymousUser()
+    return throttle.allow_request(request, None)
+
+
+def test_throttle_denies_past_the_limit_until_the_next_window(throttle_store):
+    throttle = ThreePerMinuteThrottle()
+
+    assert [hit(throttle, 600 + second) for second in range(4)] == [True, True, True, False]
+    # The next window still counts the full previous one at its start
+    assert throttle.wait() == pytest.approx(60 - 3)
+
+
+def test_throttle_weights_the_previous_window(throttle_store):
+    throttle = ThreePerMinuteThrottle()
+    for _ in range(3):
+        hit(throttle, 600)
+
+    # Halfway through the next window the previous one counts for 1.5 requests
+    assert [hit(throttle, 690) for _ in range(3)] == [True, True, False]
+    assert throttle.wait() == pytest.approx(10)
+    # Two windows later nothing is left of the first one
+    assert [hit(throttle, 780) for _ in range(4)] == [True, True, True, False]
+
+
+def test_local_throttle_counters_expire_and_are_swept():
+    with mock.patch("core_apps.common.throttling.time.monotonic", return_value=0.0) as monotonic:
+        store = LocalThrottleStore()
+        assert store.hit("client", 1, 0.0, 5, 60) == (True, 0, 1)
+
+        # A counter is read until the end of the window that follows it
+        monotonic.return_value = 119.0
+        assert store.count("client:1", 119.0) == 1
+        assert store.hit("client", 2, 1.0, 5, 60) == (True, 1, 1)
+
+        # Expired counters read as zero, then go at the next sweep
+        assert store.count("client:1", 121.0) == 0
+        monotonic.return_value = 119.0 + store.prune_interval
+        assert store.hit("client", 3, 1.0, 5, 60) == (True, 1, 1)
+        assert set(store.counts) == {"client:2", "client:3"}
+
+
+def paginate(paginator_class, queryset, url: str) -> tuple:
+    paginator = paginator_class()
+    request = Request(APIRequestFactory().get(url))
+    page = paginator.paginate_queryset(queryset, request)
+    return page, paginator.get_next_link(), paginator.get_previous_link()
+
+
+def test_keyset_pages_walk_forward_and_back_through_ties():
+    apartments = [
+        Apartment.objects.create(unit_number=f"A{number}", building="A", floor=number)
+        for number in range(5)
+    ]
+    # Rows sharing a created_at are ordered by pkid
+    Apartment.objects.filter(pkid__in=[apartment.pkid for apartment in apartments[1:4]]).update(
+        created_at=apartments[1].created_at
+    )
+    expected = list(Apartment.objects.order_by("-created_at", "-pkid"))
+
+    pages, url = [], "/?page_size=2"
+    while url:
+        page, url, previous = paginate(KeysetPagination, Apartment.objects.all(), url)
+        pages.append(page)
+    assert pages == [expected[0:2], expected[2:4], expected[4:5]]
+
+    # Going back from the last page yields the same pages
+    page, _, previous = paginate(KeysetPagination, Apartment.objects.all(), previous)
+    assert page == expected[2:4]
+    page, _, previous = paginate(KeysetPagination, Apartment.objects.all(), previous)
+    assert (page, previous) == (expected[0:2], None)
+
+
+def test_keyset_cursor_round_trips():
+    apartment = Apartment.objects.create(unit_number="A1", building="A", floor=1)
+    paginator = KeysetPagination()
+    paginator.base_url = "http://testserver/?page_size=2"
+
+    url = paginator.encode_cursor(apartment, reverse=True)
+    cursor = paginator.decode_cursor(Request(APIRequestFactory().get(url)))
+
+    assert cursor == {"created_at": apartment.created_at, "pkid": apartment.pkid, "reverse": True}
+    assert "page_size=2" in url
+
+
+@pytest.mark.parametrize(
+    "cursor", ["not-base64!", b64encode(b"p=1").decode(), b64encode(b"t=yesterday&p=1").decode()]
+)
+def test_invalid_keyset_cursor_is_not_found(cursor):
+    response = APIClient().get("/api/v1/apartments/available/", {"cursor": cursor})
+
+    assert response.status_code == 404
+
+
+def test_ranked_pages_follow_rank_then_pkid():
+    for number in range(5):
+        Apartment.objects.create(unit_number=f"A{number}", building="A", floor=number % 3)
+    # Ranks below one, with ties, as a text search would produce
+    ranked = Apartment.objects.annotate(rank=Cast(F("floor"), FloatField()) / 10 + 0.1)
+    expected = list(ranked.order_by("-rank", "-pkid"))
+
+    pages, url = [], "/?page_size=2"
+    while url:
+        page, url, previous = paginate(RankedKeysetPagination, ranked, url)
+        pages.append(page)
+        assert previous is None
+
+    assert pages == [expected[0:2], expected[2:4], expected[4:5]]
+
+
+def test_ranked_cursor_round_trips_the_rank():
+    apartment = Apartment.objects.create(unit_number="A1", building="A", floor=1)
+    apartment.rank = 0.1 + 0.2
+    paginator = RankedKeysetPagination()
+    paginator.base_url = "http://testserver/?q=leak"
+
+    url = paginator.encode_cursor(apartment, reverse=False)
+    cursor = paginator.decode_cursor(Request(APIRequestFactory().get(url)))
+
+    assert cursor == {"rank": 0.1 + 0.2, "pkid": apartment.pkid}
+
+
+def test_search_pages_through_matches(issue):
+    for number in range(4):
+        Issue.objects.create(
+            apartment=issue.apartment,
+            reported_by=issue.reported_by,
+            title=f"Leak {number}" if number % 2 else "Broken window",
+            description="Water leak under the sink" if number < 2 else "Nothing else",
+        )
+    client = APIClient()
+    client.force_authenticate(make_user("staff", is_staff=True))
+
+    titles, url = [], "/api/v1/issues/search/?q=leak&page_size=2"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        results = response.data
+        titles.extend(result["title"] for result in results["results"])
+        url = results["next"]
+
+    assert sorted(titles) == ["Broken window", "Leak", "Leak 1", "Leak 3"]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", b64encode(b"k=high&p=1").decode()])
+def test_invalid_ranked_cursor_is_not_found(cursor):
+    client = APIClient()
+    client.force_authenticate(make_user("staff", is_staff=True))
+
+    response = client.get("/api/v1/issues/search/", {"q": "leak", "cursor": cursor})
+
+    assert response.status_code == 404
+
+
+def test_csv_rows_write_nested_values_as_json():
+    rows = [{"unit": "A1", "tenant": None, "tags": ["quiet", "sunny"], "owner": {"floor": 1}}]
+
+    assert CSVRenderer().write_rows(rows, first=True).decode().splitlines() == [
+        "unit,tenant,tags,owner",
+        'A1,,"[""quiet"",""sunny""]","{""floor"":1}"',
+    ]
+    assert CSVRenderer().write_rows(rows, first=False).decode().count("unit") == 0
+
+
+def test_ndjson_rows_are_one_object_per_line():
+    rows = [{"unit": "A1"}, {"unit": "A2"}]
+
+    lines = NDJSONRenderer().write_rows(rows, first=True).splitlines()
+
+    assert [json.loads(line) for line in lines] == rows
+
+
+def test_csv_export_streams_every_row_under_one_header(monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(ApartmentListAPIView, "export_chunk_size", 2)
+    for number in range(5):
+        Apartment.objects.create(unit_number=f"A{number}", building="A", floor=number)
+    client = APIClient()
+    client.force_authenticate(make_user("staff", is_staff=True))
+
+    response = client.get("/api/v1/apartments/available/", {"format": "csv"})
+
+    assert response.status_code == 200
+    assert response["Content-Disposition"] == 'attachment; filename="apartments.csv"'
+    rows = list(csv.DictReader(b"".join(response.streaming_content).decode().splitlines()))
+    # The header is only written with the first chunk
+    assert sorted(row["unit_number"] for row in rows) == [f"A{number}" for number in range(5)]
+
+
+@pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+def test_export_denied_to_non_staff_is_rendered_as_json(export_format):
+    cache.clear()
+
+    response = APIClient().get("/api/v1/apartments/available/", {"format": export_format})
+
+    assert response.status_code == 403
+    assert response["Content-Type"].startswith("application/json")
+    assert "Exports are restricted" in json.dumps(json.loads(response.content))
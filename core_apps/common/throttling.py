@@ -0,0 +1,148 @@
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Tuple
+
+from django.conf import settings
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+# (allowed, previous window count, current window count)
+Hit = Tuple[bool, int, int]
+
+
+class LocalThrottleStore:
+    """
+    Window counters kept in process memory. Limits only apply per process,
+    so it stands in for Redis in tests and single-process development servers.
+
+    Counters expire like their Redis counterparts, and expired ones are swept
+    every `prune_interval` seconds so clients that never come back do not
+    stay in memory.
+    """
+
+    prune_interval = 60
+
+    def __init__(self) -> None:
+        self.counts = {}  # counter key -> (count, expires at)
+        self.lock = threading.Lock()
+        self.next_prune = time.monotonic() + self.prune_interval
+
+    def count(self, key: str, now: float) -> int:
+        count, expires_at = self.counts.get(key, (0, now))
+        return count if expires_at > now else 0
+
+    def prune(self, now: float) -> None:
+        self.counts = {key: entry for key, entry in self.counts.items() if entry[1] > now}
+        self.next_prune = now + self.prune_interval
+
+    def hit(self, key: str, window: int, weight: float, limit: int, duration: int) -> Hit:
+        now = time.monotonic()
+        with self.lock:
+            if now >= self.next_prune:
+                self.prune(now)
+            previous = self.count(f"{key}:{window - 1}", now)
+            current = self.count(f"{key}:{window}", now)
+            if previous * weight + current >= limit:
+                return False, previous, current
+            # A window's counter is read until the end of the following one
+            self.counts[f"{key}:{window}"] = (current + 1, now + 2 * duration)
+            return True, previous, current + 1
+
+
+class RedisThrottleStore:
+    """
+    Window counters shared by every worker. The check and the increment run
+    in one Lua script, so concurrent requests cannot both take the last slot.
+    """
+
+    hit_script = """
+    local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+    if previous * tonumber(ARGV[1]) + current >= tonumber(ARGV[2]) then
+        return {0, previous, current}
+    end
+    current = redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    return {1, previous, current}
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.check_and_increment = self.client.register_script(self.hit_script)
+
+    def hit(self, key: str, window: int, weight: float, limit: int, duration: int) -> Hit:
+        allowed, previous, current = self.check_and_increment(
+            # A window's counter is read until the end of the following one
+            keys=[f"{key}:{window}", f"{key}:{window - 1}"],
+            args=[repr(weight), limit, 2 * duration],
+        )
+        return bool(allowed), int(previous), int(current)
+
+
+@lru_cache(maxsize=None)
+def get_throttle_store():
+    if settings.REDIS_URL:
+        return RedisThrottleStore(settings.REDIS_URL)
+    return LocalThrottleStore()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle counting requests in an approximate sliding window.
+
+    Requests are counted per fixed window of the rate's duration; the
+    sliding count is the current window's plus the previous one's weighted
+    by how much of it the sliding window still covers. Two counters per key
+    instead of a list of timestamps, whatever the rate.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        position = self.timer() / self.duration
+        window = math.floor(position)
+        self.elapsed = position - window  # fraction of the current window gone
+        allowed, self.previous, self.current = get_throttle_store().hit(
+            self.key, window, 1 - self.elapsed, self.num_requests, self.duration
+        )
+        return allowed
+
+    def wait(self):
+        """
+        Seconds until the sliding count drops below the limit, assuming no
+        other request comes in meanwhile.
+        """
+        if self.current < self.num_requests:
+            # The previous window's share decreases until it makes room
+            room = 1 - (self.num_requests - self.current) / self.previous
+            return max(0.0, room - self.elapsed) * self.duration
+        # Wait for the next window, then for the current count's share to decrease
+        return (1 - self.elapsed + 1 - self.num_requests / self.current) * self.duration
+
+
+class AnonSlidingWindowThrottle(AnonRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class UserSlidingWindowThrottle(UserRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class ScopedSlidingWindowThrottle(ScopedRateThrottle, SlidingWindowRateThrottle):
+    """
+    Per-endpoint limit, applied to views setting `throttle_scope` on top of
+    the anon and user limits.
+    """
@@ -0,0 +1,167 @@
+import json
+import logging
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ContentView
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 5000
+FLUSH_MAX_BATCHES = 20
+
+
+class LocalViewBuffer:
+    """
+    In-process view buffer. Only visible to the process that filled it, so it
+    stands in for Redis in tests and single-process development servers.
+    """
+
+    def __init__(self) -> None:
+        self.events = deque()
+        self.lock = threading.Lock()
+
+    def push(self, event: str) -> None:
+        self.events.append(event)
+
+    def drain(self, max_items: int) -> List[str]:
+        with self.lock:
+            return [self.events.popleft() for _ in range(min(max_items, len(self.events)))]
+
+
+class RedisViewBuffer:
+    """
+    View buffer shared by every web worker, stored in a Redis list.
+
+    Draining is a single MULTI/EXEC (LRANGE + LTRIM), so concurrent flushes
+    never see the same event twice. Events drained by a worker that dies
+    before writing them are lost, which is acceptable for view statistics.
+    """
+
+    key = "common:content_views:buffer"
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def push(self, event: str) -> None:
+        self.client.rpush(self.key, event)
+
+    def drain(self, max_items: int) -> List[str]:
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.lrange(self.key, 0, max_items - 1)
+        pipeline.ltrim(self.key, max_items, -1)
+        events, _ = pipeline.execute()
+        return [event.decode("utf-8") for event in events]
+
+
+@lru_cache(maxsize=None)
+def get_view_buffer():
+    if settings.REDIS_URL:
+        return RedisViewBuffer(settings.REDIS_URL)
+    return LocalViewBuffer()
+
+
+def buffer_view(content_object, user, viewer_ip: str | None) -> None:
+    """
+    Records a view without touching the database. The event is written to
+    ContentView later by the flush_content_views task.
+    """
+    content_type = ContentType.objects.get_for_model(content_object)  # cached after the first call
+    event = {
+        "content_type": content_type.pk,
+        "object_id": content_object.pkid,
+        "user": user.pkid if user is not None and user.is_authenticated else None,
+        "viewer_ip": viewer_ip,
+        "viewed_at": timezone.now().isoformat(),
+    }
+    get_view_buffer().push(json.dumps(event))
+
+
+def write_views(events: Iterable[dict]) -> Dict[int, Set[int]]:
+    """
+    Writes view events to ContentView with one INSERT ... ON CONFLICT DO
+    UPDATE last_viewed. Returns the touched object ids grouped by content
+    type id.
+    """
+    touched = {}
+
+    # Collapse repeated views of the same row, a single INSERT cannot update a row twice
+    latest = {}
+    for event in events:
+        key = (event["content_type"], event["object_id"], event["user"], event["viewer_ip"])
+        viewed_at = parse_datetime(event["viewed_at"])
+        if key not in latest or latest[key] < viewed_at:
+            latest[key] = viewed_at
+
+    upserts, fallbacks = [], []
+    for (content_type_id, object_id, user_id, viewer_ip), viewed_at in latest.items():
+        view = ContentView(
+            content_type_id=content_type_id,
+            object_id=object_id,
+            user_id=user_id,
+            viewer_ip=viewer_ip,
+            last_viewed=viewed_at,
+        )
+        # NULLs never conflict in a unique index, these rows go through the ORM lookup
+        (fallbacks if user_id is None or viewer_ip is None else upserts).append(view)
+        touched.setdefault(content_type_id, set()).add(object_id)
+
+    with transaction.atomic():
+        ContentView.objects.bulk_create(
+            upserts,
+            update_conflicts=True,
+            unique_fields=["content_type", "object_id", "user", "viewer_ip"],
+            update_fields=["last_viewed"],
+        )
+        for view in fallbacks:
+            ContentView.objects.update_or_create(
+                content_type_id=view.content_type_id,
+                object_id=view.object_id,
+                user_id=view.user_id,
+                viewer_ip=view.viewer_ip,
+                defaults={"last_viewed": view.last_viewed},
+            )
+
+    return touched
+
+
+def refresh_view_counts(touched: Dict[int, Set[int]]) -> None:
+    # Models keeping a denormalized counter expose refresh_view_counts(pkids)
+    for content_type_id, object_ids in touched.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        refresh = getattr(model, "refresh_view_counts", None)
+        if refresh is not None:
+            refresh(object_ids)
+
+
+def flush_view_buffer(
+    batch_size: int = FLUSH_BATCH_SIZE, max_batches: int = FLUSH_MAX_BATCHES
+) -> Dict[int, Set[int]]:
+    """
+    Drains the shared buffer into ContentView, one INSERT per batch. Returns
+    the touched object ids grouped by content type id.
+    """
+    touched = {}
+
+    for _ in range(max_batches):
+        events = get_view_buffer().drain(batch_size)
+        if not events:
+            break
+
+        written = write_views(json.loads(raw) for raw in events)
+        for content_type_id, object_ids in written.items():
+            touched.setdefault(content_type_id, set()).update(object_ids)
+
+        logger.info(f"Flushed {len(events)} buffered view(s)")
+
+    return touched
@@ -1,11 +1,10 @@
 from django.contrib import admin
-from django.contrib.contenttypes.models import ContentType
 from core_apps.common.admin import ContentViewInline
-from core_apps.common.models import ContentView
-from .models import Issue
+from .models import EscalationRun, Issue
 from core_apps.users.models import User
 from django.db.models import Q
 from django.forms import ModelForm
+from .assignment import assign_new_issues
 from .emails import send_resolution_email, send_issue_confirmation_email
 from django.utils import timezone
 
@@ -40,16 +39,19 @@ class IssueAdmin(admin.ModelAdmin):
         "assigned_to",
         "status",
         "priority",
+        "category",
         "get_total_views",
     ]
     list_display_links = ["id", "apartment"]
-    list_filter = ["status", "priority"]
+    list_filter = ["status", "priority", "category"]
     search_fields = ["apartment__unit_number", "reported_by__first_name", "reported_by__last_name"]
     ordering = ["-created_at"]
     autocomplete_fields = ["apartment"]
     inlines = [ContentViewInline]
     readonly_fields = ["resolved_on"]
+    list_select_related = ["apartment", "reported_by", "assigned_to"]
     form = IssueForm
+    actions = ["assign_automatically"]
 
     def has_change_permission(self, request, obj=None):
         # Interdire la modification si l'objet existe et son statut est RESOLVED
@@ -58,22 +60,42 @@ class IssueAdmin(admin.ModelAdmin):
         return super().has_change_permission(request, obj)
 
     def get_total_views(self, obj):
-        content_type = ContentType.objects.get_for_model(obj)
-        views = ContentView.objects.filter(
-            content_type=content_type, object_id=obj.pkid
-        ).count()
-        return views
+        return obj.view_count
 
     def save_model(self, request, obj, form, change):
         is_new = not change
+        is_resolving = False
         if is_new:
             obj.status = Issue.IssueStatus.REPORTED  # Set the status to REPORTED for a new issue
-            send_issue_confirmation_email(obj)
         elif 'status' in form.changed_data:
             if obj.status == Issue.IssueStatus.RESOLVED and form.initial['status'] != Issue.IssueStatus.RESOLVED:
                 obj.resolved_on = timezone.now().date()
                 obj.resolved_by = request.user
-                send_resolution_email(obj)
+                is_resolving = True
         super().save_model(request, obj, form, change)
+        # Emails are queued once the issue is saved, so they carry its primary key
+        if is_new:
+            send_issue_confirmation_email(obj)
+        elif is_resolving:
+            send_resolution_email(obj)
+
+    @admin.action(description="Assign selected issues to the least loaded technician")
+    def assign_automatically(self, request, queryset):
+        assigned = assign_new_issues(queryset.values_list("pkid", flat=True))
+        self.message_user(request, f"{assigned} issue(s) assigned.")
+
+    get_total_views.short_description = "Total Views"
+    get_total_views.admin_order_field = "view_count"
 
-    get_total_views.short_description = "Total Views"
\ No newline at end of file
+
+@admin.register(EscalationRun)
+class EscalationRunAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "duration", "batches", "escalated_count", "breached_count", "hit_batch_limit"]
+    list_filter = ["hit_batch_limit"]
+    ordering = ["-created_at"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
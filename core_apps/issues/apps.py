@@ -5,3 +5,6 @@ class IssuesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.issues"
     verbose_name = _("Apartments' Issues")
+
+    def ready(self):
+        import core_apps.issues.emails  # noqa: F401 registers the issue notifications
@@ -0,0 +1,138 @@
+import logging
+from collections import defaultdict
+from typing import Iterable, List
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, Count, When
+
+from core_apps.common.notifications import enqueue_notifications
+from core_apps.profiles.models import Profile
+
+from .load_index import Loads, get_load_index
+from .models import Issue, IssueEvent
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+def load_technician_loads() -> Loads:
+    """
+    Open issue count of every active technician, grouped by occupation.
+    Two queries whatever the number of technicians and issues.
+    """
+    occupations = dict(
+        User.objects.filter(is_active=True, is_staff=False, is_superuser=False)
+        .exclude(profile__occupation=Profile.Occupation.TENANT)
+        .values_list("pkid", "profile__occupation")
+    )
+    loads = defaultdict(dict)
+    for pkid, occupation in occupations.items():
+        loads[occupation][pkid] = 0
+
+    open_counts = (
+        Issue.objects.filter(status__in=Issue.OPEN_STATUSES, assigned_to__isnull=False)
+        .order_by()
+        .values_list("assigned_to")
+        .annotate(total=Count("pkid"))
+    )
+    for pkid, total in open_counts:
+        if pkid in occupations:
+            loads[occupations[pkid]][pkid] = total
+    return dict(loads)
+
+
+def rebuild_load_index() -> List[str]:
+    """
+    Reloads the load index from the database, returns the occupations that
+    have at least one technician.
+    """
+    loads = load_technician_loads()
+    get_load_index().reset(loads)
+    return [occupation for occupation, technicians in loads.items() if technicians]
+
+
+def assign_issues(issues, limit: int | None = None) -> List[tuple]:
+    """
+    Locks up to `limit` issues of the `issues` queryset with SELECT ... FOR
+    UPDATE SKIP LOCKED, assigns each to the least loaded technician of its
+    category with one UPDATE and logs the assignments to the changefeed with
+    one INSERT. Issues locked by another run are left to it. Returns the
+    (issue pkid, technician pkid) pairs assigned.
+
+    A pick counts the issue in the load index right away so that concurrent
+    runs spread their issues, and is given back if the transaction rolls
+    back. The transaction is durable: no enclosing one can roll it back
+    after the picks are kept.
+    """
+    index = get_load_index()
+    if not index.is_ready():
+        rebuild_load_index()
+
+    assigned, events = [], []
+    try:
+        with transaction.atomic(durable=True):
+            batch = issues.select_for_update(skip_locked=True).values_list(
+                "pkid", "category", "reported_by_id"
+            )
+            for pkid, category, reported_by_id in batch if limit is None else batch[:limit]:
+                technician = index.pick(category)
+                if technician is not None:
+                    assigned.append((pkid, technician))
+                    events.append(
+                        IssueEvent(
+                            issue_id=pkid,
+                            event_type=IssueEvent.EventType.ASSIGNED,
+                            reported_by_id=reported_by_id,
+                            assigned_to_id=technician,
+                        )
+                    )
+
+            if assigned:
+                Issue.objects.filter(pkid__in=[pkid for pkid, _ in assigned]).update(
+                    assigned_to_id=Case(
+                        *(When(pkid=pkid, then=technician) for pkid, technician in assigned)
+                    )
+                )
+                IssueEvent.objects.bulk_create(events)
+                enqueue_notifications(("issue_assignment", {"issue_id": pkid}) for pkid, _ in assigned)
+    except Exception:
+        for _, technician in assigned:
+            index.adjust(technician, -1)
+        raise
+    return assigned
+
+
+def unassigned_backlog():
+    return Issue.objects.filter(
+        status__in=Issue.OPEN_STATUSES, assigned_to__isnull=True, category__isnull=False
+    ).order_by("created_at")
+
+
+def assign_backlog(batch_size: int = 1000, limit: int | None = None) -> int:
+    """
+    Assigns every unassigned open issue with a category, oldest first.
+
+    The load index is rebuilt from the database once, then each batch costs a
+    SELECT ... FOR UPDATE SKIP LOCKED and one UPDATE. Returns the number of
+    assigned issues.
+    """
+    # Issues of a category without technicians are left out, they would be
+    # selected again by every batch
+    categories = rebuild_load_index()
+    backlog = unassigned_backlog().filter(category__in=categories)
+    total = 0
+    while limit is None or total < limit:
+        size = batch_size if limit is None else min(batch_size, limit - total)
+        assigned = assign_issues(backlog, size)
+        total += len(assigned)
+        if not assigned:
+            # Nothing left, or technicians deactivated since the rebuild, left to the next run
+            break
+
+    logger.info(f"Assigned {total} backlog issue(s)")
+    return total
+
+
+def assign_new_issues(pkids: Iterable[int]) -> int:
+    return len(assign_issues(unassigned_backlog().filter(pkid__in=list(pkids))))
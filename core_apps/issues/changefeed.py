@@ -0,0 +1,97 @@
+import re
+from typing import List, Tuple
+
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.fields import BigIntegerField
+
+from .models import IssueEvent
+
+# Position in the feed: (transaction id, event pkid), rendered as "<xid>-<pkid>"
+Cursor = Tuple[int, int]
+
+CURSOR_RE = re.compile(r"^(\d+)-(\d+)$")
+MAX_EVENTS = 200
+
+# Every transaction with a smaller id has either committed or rolled back.
+#
+# The gate is cluster-wide: any transaction that has written anything, to any
+# table of any database of the PostgreSQL cluster, holds back events committed
+# after it started until it ends. Read-only transactions take no id and do not
+# count. The feed therefore lags by the longest running write transaction,
+# which is bounded by keeping write transactions short (rebuild_rankings
+# commits per batch) and, where DB_IDLE_IN_TRANSACTION_TIMEOUT is set, by
+# idle_in_transaction_session_timeout.
+OLDEST_RUNNING_TRANSACTION_SQL = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_cursor(value: str) -> Cursor:
+    match = CURSOR_RE.match(value or "")
+    if match is None:
+        raise InvalidCursor("Invalid cursor.")
+    return int(match.group(1)), int(match.group(2))
+
+
+def format_cursor(cursor: Cursor) -> str:
+    return f"{cursor[0]}-{cursor[1]}"
+
+
+def head_cursor() -> Cursor:
+    """
+    Cursor after every event already served, for clients starting from now.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {OLDEST_RUNNING_TRANSACTION_SQL}")
+        return cursor.fetchone()[0], 0
+
+
+def read_events(user, since: Cursor, limit: int = MAX_EVENTS) -> Tuple[List[dict], Cursor, bool]:
+    """
+    Events visible to `user` after `since`, in feed order.
+
+    The feed is ordered by writing transaction, not by insert order, and only
+    serves events of transactions older than every running transaction. Such
+    a transaction can no longer add events, so a cursor never skips an event
+    committed late. Returns the events, the new cursor and whether more
+    events are already available.
+    """
+    xid, pkid = since
+    rows = list(
+        IssueEvent.objects.alias(
+            xmin=RawSQL(OLDEST_RUNNING_TRANSACTION_SQL, [], output_field=BigIntegerField())
+        )
+        .filter(Q(reported_by=user) | Q(assigned_to=user) | Q(previous_assigned_to=user))
+        .filter(Q(transaction_id__gt=xid) | Q(transaction_id=xid, pkid__gt=pkid))
+        .filter(transaction_id__lt=F("xmin"))
+        .order_by("transaction_id", "pkid")
+        .values(
+            "pkid",
+            "transaction_id",
+            "event_type",
+            "data",
+            "created_at",
+            "issue__id",
+            "assigned_to__username",
+        )[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    events = [
+        {
+            "cursor": format_cursor((row["transaction_id"], row["pkid"])),
+            "issue": str(row["issue__id"]),
+            "event_type": row["event_type"],
+            "assigned_to": row["assigned_to__username"],
+            "data": row["data"],
+            "created_at": row["created_at"].isoformat(),
+        }
+        for row in rows
+    ]
+    cursor = (rows[-1]["transaction_id"], rows[-1]["pkid"]) if rows else since
+    return events, cursor, has_more
@@ -1,84 +1,98 @@
 import logging
 
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.contrib.auth import get_user_model
 
-from backend.settings.local import SITE_NAME, DEFAULT_FROM_EMAIL  # Import settings for site name and default email
+from core_apps.common.notifications import enqueue_notification, notification  # Import the notification pipeline
 
 from .models import Issue  # Import the Issue model
 
 # Set up logger for error tracking
 logger = logging.getLogger(__name__)
 
+User = get_user_model()
+
+
+def _load_issue(issue_id: int) -> Issue | None:
+    # Load the issue with every relation the email templates read
+    issue = (
+        Issue.objects.select_related("apartment", "reported_by", "assigned_to")
+        .filter(pkid=issue_id)
+        .first()
+    )
+    if issue is None:
+        logger.warning(f"Issue {issue_id} was deleted before its notification was sent")
+    return issue
+
+
+@notification("issue_confirmation", template_name="emails/issue_confirmation.html")
+def build_issue_confirmation(issue_id: int):
+    issue = _load_issue(issue_id)
+    if issue is None:
+        return None
+    return "Issue Report Confirmation", [issue.reported_by.email], {"issue": issue}
+
+
+@notification("issue_resolved", template_name="emails/issue_resolved_notification.html")
+def build_issue_resolved(issue_id: int):
+    issue = _load_issue(issue_id)
+    if issue is None:
+        return None
+    return "Issue Resolved", [issue.reported_by.email], {"issue": issue}
+
+
+@notification("issue_resolution", template_name="emails/issue_resolved_notification.html")
+def build_issue_resolution(issue_id: int):
+    issue = _load_issue(issue_id)
+    if issue is None:
+        return None
+    return f"Issue Resolved: {issue.title}", [issue.reported_by.email], {"issue": issue}
+
+
+@notification("issue_assignment", template_name="emails/issue_assignment_notification.html")
+def build_issue_assignment(issue_id: int):
+    issue = _load_issue(issue_id)
+    if issue is None or issue.assigned_to is None:
+        return None
+    return f"New Issue Assigned: {issue.title}", [issue.assigned_to.email], {"issue": issue}
+
+
+@notification("issue_escalation", template_name="emails/issue_escalation.html")
+def build_issue_escalation(issue_ids: list, previous_priority: str):
+    issues = list(
+        Issue.objects.select_related("apartment", "assigned_to")
+        .filter(pkid__in=issue_ids)
+        .order_by("created_at")
+    )
+    recipients = list(
+        User.objects.filter(is_staff=True, is_active=True).values_list("email", flat=True)
+    )
+    if not issues or not recipients:
+        return None
+    context = {
+        "issues": issues,
+        "previous_priority": Issue.Priority(previous_priority).label,
+        "breached": previous_priority not in Issue.ESCALATED_PRIORITY,
+    }
+    return f"{len(issues)} issue(s) past their deadline", recipients, context
+
+
 # Function to send an email confirming an issue report
 def send_issue_confirmation_email(issue: Issue) -> None:
     """
-    Sends a confirmation email to the user who reported the issue.
+    Queues a confirmation email to the user who reported the issue.
     """
-    try:
-        subject = "Issue Report Confirmation"  # Set the email subject
-        context = {"issue": issue, "site_name": SITE_NAME}  # Define the context for the email template
-        html_email = render_to_string("emails/issue_confirmation.html", context)  # Render the HTML email template
-        text_email = strip_tags(html_email)  # Extract plain text from the HTML email
-        from_email = DEFAULT_FROM_EMAIL  # Get the default email address from settings
-        to = [issue.reported_by.email]  # Set the recipient of the email
-        email = EmailMultiAlternatives(subject, text_email, from_email, to)  # Create the email object
-
-        email.attach_alternative(html_email, "text/html")  # Attach the HTML version of the email
-        email.send()  # Send the email
-    except Exception as e:
-        logger.error(
-            f"Failed to send confirmation email for issue '{issue.title}':{e}",  # Log the error
-            exc_info=True,
-        )
+    enqueue_notification("issue_confirmation", issue_id=issue.pkid)
 
 # Function to send an email notifying the user that their issue has been resolved
 def send_issue_resolved_email(issue: Issue) -> None:
     """
-    Sends an email to the user who reported the issue, notifying them that it has been resolved.
+    Queues an email to the user who reported the issue, notifying them that it has been resolved.
     """
-    try:
-        subject = "Issue Resolved"  # Set the email subject
-        context = {"issue": issue, "site_name": SITE_NAME}  # Define the context for the email template
-        html_email = render_to_string(
-            "emails/issue_resolved_notification.html", context
-        )  # Render the HTML email template
-        text_email = strip_tags(html_email)  # Extract plain text from the HTML email
-        from_email = DEFAULT_FROM_EMAIL  # Get the default email address from settings
-        to = [issue.reported_by.email]  # Set the recipient of the email
-        email = EmailMultiAlternatives(subject, text_email, from_email, to)  # Create the email object
-
-        email.attach_alternative(html_email, "text/html")  # Attach the HTML version of the email
-        email.send()  # Send the email
-    except Exception as e:
-        logger.error(
-            f"Failed to send resolution email for issue '{issue.title}':{e}",  # Log the error
-            exc_info=True,
-        )
+    enqueue_notification("issue_resolved", issue_id=issue.pkid)
 
 # Function to send an email notifying the user that their issue has been resolved
 def send_resolution_email(issue: Issue) -> None:
     """
-    Sends an email to the user who reported the issue, notifying them that it has been resolved.
+    Queues an email to the user who reported the issue, notifying them that it has been resolved.
     """
-    try:
-        subject = f"Issue Resolved: {issue.title}"  # Set the email subject
-        from_email = DEFAULT_FROM_EMAIL  # Get the default email address from settings
-        recipient_list = [issue.reported_by.email]  # Set the recipient of the email
-        context = {"issue": issue, "site_name": SITE_NAME}  # Define the context for the email template
-        html_email = render_to_string(
-            "emails/issue_resolved_notification.html", context
-        )  # Render the HTML email template
-        text_email = strip_tags(html_email)  # Extract plain text from the HTML email
-        email = EmailMultiAlternatives(
-            subject, text_email, from_email, recipient_list
-        )  # Create the email object
-
-        email.attach_alternative(html_email, "text/html")  # Attach the HTML version of the email
-        email.send()  # Send the email
-    except Exception as e:
-        logger.error(
-            f"Failed to send resolution email for issue '{issue.title}':{e}",  # Log the error
-            exc_info=True,
-        )
\ No newline at end of file
+    enqueue_notification("issue_resolution", issue_id=issue.pkid)
@@ -0,0 +1,83 @@
+import logging
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from core_apps.common.notifications import enqueue_notification
+
+from .models import EscalationRun, Issue
+
+logger = logging.getLogger(__name__)
+
+ESCALATION_BATCH_SIZE = 500
+ESCALATION_MAX_BATCHES = 20
+
+
+def overdue_issues(status: str, priority: str, now):
+    # Range read of issue_sla_pending_idx, already in priority_changed_at order
+    return Issue.objects.filter(
+        status=status,
+        priority=priority,
+        priority_changed_at__lt=now - Issue.SLA_DEADLINES[priority],
+        sla_breached_at__isnull=True,
+    ).order_by("priority_changed_at")
+
+
+def escalate_overdue_issues(
+    batch_size: int = ESCALATION_BATCH_SIZE, max_batches: int = ESCALATION_MAX_BATCHES
+) -> EscalationRun:
+    """
+    Escalates open issues that stayed at their priority past its SLA
+    deadline, at most `max_batches` batches per run; what is left is handled
+    by the next run.
+
+    Each batch locks up to `batch_size` overdue issues (skipping rows locked
+    by a concurrent run), raises their priority or flags them as breached
+    with one UPDATE and queues one staff notification. Returns the recorded run.
+    """
+    started = time.perf_counter()
+    now = timezone.now()
+    run = EscalationRun(duration=0)
+
+    # HIGH first: issues escalated to a level during this run are not overdue there
+    levels = [
+        (status, priority)
+        for priority in reversed(list(Issue.SLA_DEADLINES))
+        for status in Issue.OPEN_STATUSES
+    ]
+    for status, priority in levels:
+        while run.batches < max_batches:
+            with transaction.atomic():
+                pkids = list(
+                    overdue_issues(status, priority, now)
+                    .select_for_update(skip_locked=True)
+                    .values_list("pkid", flat=True)[:batch_size]
+                )
+                if not pkids:
+                    break
+
+                escalated_priority = Issue.ESCALATED_PRIORITY.get(priority)
+                if escalated_priority is not None:
+                    Issue.objects.filter(pkid__in=pkids).update(
+                        priority=escalated_priority, priority_changed_at=now
+                    )
+                    run.escalated_count += len(pkids)
+                else:
+                    Issue.objects.filter(pkid__in=pkids).update(sla_breached_at=now)
+                    run.breached_count += len(pkids)
+                enqueue_notification(
+                    "issue_escalation", issue_ids=pkids, previous_priority=priority
+                )
+            run.batches += 1
+            if len(pkids) < batch_size:
+                break
+
+    run.hit_batch_limit = run.batches >= max_batches
+    run.duration = time.perf_counter() - started
+    run.save()
+    logger.info(
+        f"SLA escalation: {run.escalated_count} escalated, {run.breached_count} breached "
+        f"in {run.batches} batch(es), {run.duration:.3f}s"
+    )
+    return run
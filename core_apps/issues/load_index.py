@@ -0,0 +1,165 @@
+import heapq
+import threading
+from functools import lru_cache
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+# occupation -> {technician pkid: number of open issues}
+Loads = Dict[str, Dict[int, int]]
+
+
+class LocalLoadIndex:
+    """
+    Per-occupation min-heaps of technician load kept in process memory.
+
+    Heap entries are (load, pkid) and are never updated in place: a changed
+    load pushes a new entry and stale ones are skipped when they surface.
+    Only visible to the process that filled it, so it stands in for Redis in
+    tests and single worker setups.
+    """
+
+    def __init__(self) -> None:
+        self.heaps = {}
+        self.loads = {}  # pkid -> [occupation, load]
+        self.lock = threading.Lock()
+        self.ready = False
+
+    def reset(self, loads: Loads) -> None:
+        with self.lock:
+            self.loads = {
+                pkid: [occupation, load]
+                for occupation, technicians in loads.items()
+                for pkid, load in technicians.items()
+            }
+            self.heaps = {
+                occupation: [(load, pkid) for pkid, load in technicians.items()]
+                for occupation, technicians in loads.items()
+            }
+            for heap in self.heaps.values():
+                heapq.heapify(heap)
+            self.ready = True
+
+    def is_ready(self) -> bool:
+        return self.ready
+
+    def pick(self, occupation: str) -> Optional[int]:
+        """
+        Returns the least loaded technician of `occupation` and counts one more
+        open issue for them, or None when there is no technician.
+        """
+        with self.lock:
+            heap = self.heaps.get(occupation)
+            while heap:
+                load, pkid = heap[0]
+                current = self.loads.get(pkid)
+                if current is None or current[0] != occupation or current[1] != load:
+                    heapq.heappop(heap)  # stale entry
+                    continue
+                current[1] += 1
+                heapq.heapreplace(heap, (load + 1, pkid))
+                return pkid
+            return None
+
+    def adjust(self, pkid: int, delta: int) -> None:
+        with self.lock:
+            current = self.loads.get(pkid)
+            if current is None:
+                return
+            current[1] = max(0, current[1] + delta)
+            heap = self.heaps[current[0]]
+            heapq.heappush(heap, (current[1], pkid))
+            if len(heap) > 2 * len(self.loads) + 64:
+                # Too many stale entries, rebuild this heap from the live loads
+                self.heaps[current[0]] = heap = [
+                    (load, technician)
+                    for technician, (occupation, load) in self.loads.items()
+                    if occupation == current[0]
+                ]
+                heapq.heapify(heap)
+
+
+class RedisLoadIndex:
+    """
+    Technician load shared by every process, one sorted set per occupation.
+
+    A sorted set read from its lowest score is a min-heap; picking and
+    incrementing run in one Lua script so concurrent pickers never choose
+    the same minimum.
+    """
+
+    prefix = "issues:technician_load"
+    occupations_key = "issues:technician_load:occupations"
+    ready_key = "issues:technician_load:ready"
+
+    pick_script = """
+    local member = redis.call('ZRANGE', KEYS[1], 0, 0)[1]
+    if not member then return false end
+    redis.call('ZINCRBY', KEYS[1], 1, member)
+    return member
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.pick_min = self.client.register_script(self.pick_script)
+
+    def key(self, occupation: str) -> str:
+        return f"{self.prefix}:{occupation}"
+
+    def reset(self, loads: Loads) -> None:
+        pipeline = self.client.pipeline(transaction=True)
+        for occupation in self.client.hvals(self.occupations_key):
+            pipeline.delete(self.key(occupation.decode("utf-8")))
+        pipeline.delete(self.occupations_key)
+        for occupation, technicians in loads.items():
+            if technicians:
+                pipeline.zadd(self.key(occupation), technicians)
+                pipeline.hset(self.occupations_key, mapping={pkid: occupation for pkid in technicians})
+        pipeline.set(self.ready_key, 1)
+        pipeline.execute()
+
+    def is_ready(self) -> bool:
+        return bool(self.client.exists(self.ready_key))
+
+    def pick(self, occupation: str) -> Optional[int]:
+        member = self.pick_min(keys=[self.key(occupation)])
+        return int(member) if member is not None else None
+
+    def adjust(self, pkid: int, delta: int) -> None:
+        occupation = self.client.hget(self.occupations_key, pkid)
+        if occupation is not None:
+            self.client.zincrby(self.key(occupation.decode("utf-8")), delta, pkid)
+
+
+@lru_cache(maxsize=None)
+def get_load_index():
+    if settings.REDIS_URL:
+        return RedisLoadIndex(settings.REDIS_URL)
+    return LocalLoadIndex()
+
+
+def issue_load_changes(issue) -> Dict[int, int]:
+    """
+    Load changes implied by saving `issue`: its open issue moves from the
+    previous assignee to the new one, or is added or removed when the status
+    enters or leaves the open statuses. Must be called before the save.
+    """
+    open_statuses = type(issue).OPEN_STATUSES
+    changes = {}
+    if not issue._state.adding and issue.get_initial_value("status") in open_statuses:
+        previous = issue.get_initial_value("assigned_to")
+        if previous is not None:
+            changes[previous] = changes.get(previous, 0) - 1
+    if issue.status in open_statuses and issue.assigned_to_id is not None:
+        changes[issue.assigned_to_id] = changes.get(issue.assigned_to_id, 0) + 1
+    return {pkid: delta for pkid, delta in changes.items() if delta}
+
+
+def apply_load_changes(changes: Dict[int, int]) -> None:
+    # Drift (deleted issues, queryset updates) is corrected by the next rebuild
+    if changes:
+        index = get_load_index()
+        transaction.on_commit(lambda: [index.adjust(pkid, delta) for pkid, delta in changes.items()])
@@ -0,0 +1,81 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from core_apps.issues.load_index import LocalLoadIndex, RedisLoadIndex
+from core_apps.issues.models import Issue
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the load index of the issue assignment engine on synthetic data: "
+        "builds it for --technicians technicians carrying --issues open issues, then "
+        "picks a technician for each of a --backlog of new issues. Only the index is "
+        "timed, not the SELECT ... FOR UPDATE SKIP LOCKED and CASE UPDATE each batch "
+        "of assign_backlog also runs. Nothing is read from or written to the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--technicians", type=int, default=10_000)
+        parser.add_argument("--issues", type=int, default=1_000_000)
+        parser.add_argument("--backlog", type=int, default=100_000)
+        parser.add_argument(
+            "--naive-sample",
+            type=int,
+            default=1_000,
+            help="Picks timed with a linear scan over the technicians, for comparison.",
+        )
+        parser.add_argument("--redis-url", help="Also benchmark the Redis index on this server.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        occupations = [value for value, _ in Issue._meta.get_field("category").choices]
+
+        loads = {occupation: {} for occupation in occupations}
+        occupation_of = {
+            pkid: rng.choice(occupations) for pkid in range(1, options["technicians"] + 1)
+        }
+        for pkid, occupation in occupation_of.items():
+            loads[occupation][pkid] = 0
+        started = time.perf_counter()
+        for pkid in rng.choices(list(occupation_of), k=options["issues"]):
+            loads[occupation_of[pkid]][pkid] += 1
+        self.stdout.write(
+            f"Generated {options['issues']:,} issues over {options['technicians']:,} technicians "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        backlog = [rng.choice(occupations) for _ in range(options["backlog"])]
+
+        indexes = [("local heap", LocalLoadIndex())]
+        if options["redis_url"]:
+            indexes.append(("redis", RedisLoadIndex(options["redis_url"])))
+
+        for name, index in indexes:
+            started = time.perf_counter()
+            index.reset({occupation: dict(technicians) for occupation, technicians in loads.items()})
+            built = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for category in backlog:
+                index.pick(category)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{name} (index only): built in {built * 1000:.0f}ms, {len(backlog):,} picks in "
+                f"{elapsed:.2f}s ({len(backlog) / elapsed:,.0f} picks/s)"
+            )
+
+        # What picking costs without an index: a scan of every technician of the category
+        sample = backlog[: options["naive_sample"]]
+        naive = {occupation: dict(technicians) for occupation, technicians in loads.items()}
+        started = time.perf_counter()
+        for category in sample:
+            technician = min(naive[category], key=naive[category].get)
+            naive[category][technician] += 1
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"linear scan: {len(sample):,} picks in {elapsed:.2f}s "
+            f"({len(sample) / elapsed:,.0f} picks/s)"
+        )
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:31
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_view_counts(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    ContentView = apps.get_model("common", "ContentView")
+    Issue = apps.get_model("issues", "Issue")
+
+    content_type = ContentType.objects.filter(app_label="issues", model="issue").first()
+    if content_type is None:
+        return
+
+    views = (
+        ContentView.objects.filter(content_type=content_type, object_id=OuterRef("pkid"))
+        .order_by()
+        .values("object_id")
+        .annotate(total=Count("pkid"))
+        .values("total")
+    )
+    Issue.objects.update(view_count=Coalesce(Subquery(views), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("common", "0001_initial"),
+        ("issues", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="view_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="View Count"
+            ),
+        ),
+        migrations.RunPython(backfill_view_counts, migrations.RunPython.noop),
+    ]
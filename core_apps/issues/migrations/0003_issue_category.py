@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("issues", "0002_issue_view_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="category",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("mason", "Mason"),
+                    ("carpenter", "Carpenter"),
+                    ("plumber", "Plumber"),
+                    ("roofer", "Roofer"),
+                    ("painter", "Painter"),
+                    ("electrician", "Electrician"),
+                    ("hvac", "HVAC"),
+                ],
+                max_length=20,
+                null=True,
+                verbose_name="Category",
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:44
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("issues", "0003_issue_category"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EscalationRun",
+            fields=[
+                (
+                    "pkid",
+                    models.BigAutoField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now_add=True)),
+                ("duration", models.FloatField(verbose_name="Duration (s)")),
+                (
+                    "batches",
+                    models.PositiveIntegerField(default=0, verbose_name="Batches"),
+                ),
+                (
+                    "escalated_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Escalated issues"
+                    ),
+                ),
+                (
+                    "breached_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Breached issues"
+                    ),
+                ),
+                (
+                    "hit_batch_limit",
+                    models.BooleanField(
+                        default=False, verbose_name="Stopped at the batch limit"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Escalation run",
+                "verbose_name_plural": "Escalation runs",
+                "ordering": ["-created_at", "-updated_at"],
+                "abstract": False,
+            },
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="sla_breached_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="SLA Breached At"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                condition=models.Q(
+                    ("sla_breached_at__isnull", True),
+                    ("status__in", ["reported", "in_progress"]),
+                ),
+                fields=["status", "priority", "created_at"],
+                name="issue_sla_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:46
+
+import core_apps.issues.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("issues", "0004_issue_sla_escalation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueEvent",
+            fields=[
+                (
+                    "pkid",
+                    models.BigAutoField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("assigned", "Assigned"),
+                            ("status_changed", "Status changed"),
+                            ("resolved", "Resolved"),
+                        ],
+                        max_length=20,
+                        verbose_name="Event Type",
+                    ),
+                ),
+                ("data", models.JSONField(default=dict, verbose_name="Data")),
+                (
+                    "transaction_id",
+                    models.BigIntegerField(
+                        default=core_apps.issues.models.CurrentTransactionId,
+                        verbose_name="Transaction Id",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "assigned_to",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Assigned to",
+                    ),
+                ),
+                (
+                    "issue",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="issues.issue",
+                        verbose_name="Issue",
+                    ),
+                ),
+                (
+                    "previous_assigned_to",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Previously assigned to",
+                    ),
+                ),
+                (
+                    "reported_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Reported by",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Issue event",
+                "verbose_name_plural": "Issue events",
+                "ordering": ["transaction_id", "pkid"],
+                "indexes": [
+                    models.Index(
+                        fields=["reported_by", "transaction_id", "pkid"],
+                        name="issue_event_reporter_idx",
+                    ),
+                    models.Index(
+                        fields=["assigned_to", "transaction_id", "pkid"],
+                        name="issue_event_assignee_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("previous_assigned_to__isnull", False)),
+                        fields=["previous_assigned_to", "transaction_id", "pkid"],
+                        name="issue_event_prev_assignee_idx",
+                    ),
+                    models.Index(fields=["created_at"], name="issue_event_created_idx"),
+                ],
+            },
+        ),
+    ]
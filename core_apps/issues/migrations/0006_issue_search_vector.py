@@ -0,0 +1,54 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:47
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keeps search_vector in step with title and description on every write,
+# including queryset updates and raw SQL that bypass Issue.save()
+CREATE_TRIGGER = """
+CREATE FUNCTION issues_issue_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER issues_issue_search_vector
+    BEFORE INSERT OR UPDATE OF title, description ON issues_issue
+    FOR EACH ROW EXECUTE FUNCTION issues_issue_search_vector_update();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS issues_issue_search_vector ON issues_issue;
+DROP FUNCTION IF EXISTS issues_issue_search_vector_update();
+"""
+
+# Fires the trigger once for every existing row
+BACKFILL = "UPDATE issues_issue SET title = title"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("issues", "0005_issue_event"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="issue",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="issue_search_vector_idx"
+            ),
+        ),
+    ]
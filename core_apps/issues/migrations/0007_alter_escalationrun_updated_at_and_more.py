@@ -0,0 +1,22 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("issues", "0006_issue_search_vector"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="escalationrun",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name="issue",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
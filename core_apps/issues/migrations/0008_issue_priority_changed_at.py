@@ -0,0 +1,42 @@
+# Generated by Django 4.2.11 on 2026-10-18 02:17
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# The priority history of existing issues is unknown, their SLA is counted
+# from their creation as it was before
+BACKFILL = "UPDATE issues_issue SET priority_changed_at = created_at"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("issues", "0007_alter_escalationrun_updated_at_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="issue",
+            name="issue_sla_pending_idx",
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="priority_changed_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="Priority Changed At",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                condition=models.Q(
+                    ("sla_breached_at__isnull", True),
+                    ("status__in", ["reported", "in_progress"]),
+                ),
+                fields=["status", "priority", "priority_changed_at"],
+                name="issue_sla_pending_idx",
+            ),
+        ),
+    ]
@@ -1,14 +1,21 @@
 # Import necessary modules
 import logging
+from datetime import timedelta
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMultiAlternatives
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from backend.settings.local import SITE_NAME, DEFAULT_FROM_EMAIL
 from core_apps.apartments.models import Apartment
-from core_apps.common.models import TimeStampedModel
+from core_apps.common.models import ContentView, TimeStampedModel
+from core_apps.common.notifications import enqueue_notification
+from core_apps.profiles.models import Profile
+from .load_index import apply_load_changes, issue_load_changes
 
 # Get the user model and set up logging
 User = get_user_model()
@@ -26,6 +33,23 @@ class Issue(TimeStampedModel):
         MEDIUM = ("medium", _("Medium"))
         HIGH = ("high", _("High"))
 
+    # Statuses counted in a technician's load
+    OPEN_STATUSES = (IssueStatus.REPORTED, IssueStatus.IN_PROGRESS)
+
+    # SLA: time an open issue may stay at a priority, counted from
+    # priority_changed_at, before it is escalated. Its priority is raised to
+    # the next level, and a HIGH issue is flagged as past its SLA. Higher
+    # priorities get shorter deadlines.
+    SLA_DEADLINES = {
+        Priority.LOW: timedelta(days=7),
+        Priority.MEDIUM: timedelta(days=3),
+        Priority.HIGH: timedelta(days=1),
+    }
+    ESCALATED_PRIORITY = {
+        Priority.LOW: Priority.MEDIUM,
+        Priority.MEDIUM: Priority.HIGH,
+    }
+
     # Model fields
     apartment = models.ForeignKey(
         Apartment,
@@ -61,55 +85,231 @@ class Issue(TimeStampedModel):
         default=Priority.LOW,
         verbose_name=_("Priority"),
     )
+    # Occupation of the technician who can handle the issue
+    category = models.CharField(
+        max_length=20,
+        choices=[
+            choice for choice in Profile.Occupation.choices if choice[0] != Profile.Occupation.TENANT
+        ],
+        null=True,
+        blank=True,
+        verbose_name=_("Category"),
+    )
     resolved_on = models.DateField(verbose_name=_("Resolved On"), null=True, blank=True)
+    # Maintained by the issues_issue_search_vector trigger from the title
+    # (weight A) and the description (weight B), see migration 0006
+    search_vector = SearchVectorField(null=True, editable=False)
+    # When the issue entered its current priority, the start of its SLA
+    priority_changed_at = models.DateTimeField(
+        verbose_name=_("Priority Changed At"), default=timezone.now, editable=False
+    )
+    sla_breached_at = models.DateTimeField(
+        verbose_name=_("SLA Breached At"), null=True, blank=True, editable=False
+    )
+    # Denormalized number of ContentView rows for this issue, kept in step when
+    # views are recorded and corrected by the reconcile_issue_view_counts task
+    view_count = models.PositiveIntegerField(
+        verbose_name=_("View Count"), default=0, editable=False
+    )
+
+    # Text search configuration used by the trigger and by search queries
+    SEARCH_CONFIG = "english"
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            GinIndex(fields=["search_vector"], name="issue_search_vector_idx"),
+            # Overdue issues of a status and priority are a range read on
+            # priority_changed_at, resolved and already breached issues are not indexed
+            models.Index(
+                fields=["status", "priority", "priority_changed_at"],
+                condition=models.Q(
+                    status__in=["reported", "in_progress"], sla_breached_at__isnull=True
+                ),
+                name="issue_sla_pending_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
-    def save(self, *args, **kwargs) -> None:
-        # Check if this is an existing instance
-        is_existing_instance = self.pk is not None
-        old_assigned_to = None
+    @classmethod
+    def refresh_view_counts(cls, pkids=None) -> int:
+        # Recomputes view_count from ContentView in one UPDATE, for the given
+        # issues or for all of them, only touching rows that drifted.
+        # Returns the number of corrected issues.
+        content_type = ContentType.objects.get_for_model(cls)
+        actual = Coalesce(
+            Subquery(
+                ContentView.objects.filter(content_type=content_type, object_id=OuterRef("pkid"))
+                .order_by()
+                .values("object_id")
+                .annotate(total=Count("pkid"))
+                .values("total")
+            ),
+            0,
+        )
+        issues = cls.objects.all() if pkids is None else cls.objects.filter(pkid__in=pkids)
+        return (
+            issues.annotate(actual_view_count=actual)
+            .exclude(view_count=F("actual_view_count"))
+            .update(view_count=actual)
+        )
 
-        # If it's an existing issue, get the old assigned_to user
-        if is_existing_instance:
-            old_issue = Issue.objects.get(pk=self.pk)
-            old_assigned_to = old_issue.assigned_to
+    def save(self, *args, **kwargs) -> None:
+        # Check if this is an existing instance whose assignee changed, using the
+        # values tracked since the issue was loaded instead of re-reading it
+        is_existing_instance = not self._state.adding
+        assignee_changed = is_existing_instance and self.has_changed("assigned_to")
+        if is_existing_instance and self.has_changed("priority"):
+            # The SLA of the new priority starts now
+            self.priority_changed_at = timezone.now()
+            update_fields = kwargs.get("update_fields")
+            if update_fields and "priority_changed_at" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "priority_changed_at"]
+        load_changes = issue_load_changes(self)
+        events = self.pending_events()
 
         # Call the parent class's save method
         super().save(*args, **kwargs)
+        apply_load_changes(load_changes)
+        if events:
+            IssueEvent.record(self, events)
 
-        # If the issue already exist and is assigned to non None new user, notify the new user
-        if (
-            is_existing_instance
-            and self.assigned_to != old_assigned_to
-            and self.assigned_to is not None
-        ):
+        # If the issue already exist and is assigned to non None new user, notify the
+        # new user from a Celery worker once the transaction commits
+        if assignee_changed and self.assigned_to_id is not None:
             self.notify_assigned_user()
 
-    def notify_assigned_user(self) -> None:
-        try:
-            # Prepare email details
-            subject = f"New Issue Assigned: {self.title}"
-            from_email = DEFAULT_FROM_EMAIL
-            recipient_list = [self.assigned_to.email]
-            context = {"issue": self, "site_name": SITE_NAME}
-
-            # Render email templates
-            html_email = render_to_string(
-                "emails/issue_assignment_notification.html", context
-            )
-            text_email = strip_tags(html_email)
-
-            # Create and send the email
-            email = EmailMultiAlternatives(
-                subject, text_email, from_email, recipient_list
+    def pending_events(self) -> list:
+        # Changefeed events implied by saving the issue, computed before the save
+        events = []
+        if self._state.adding:
+            events.append((IssueEvent.EventType.CREATED, {"status": self.status}, None))
+        elif self.has_changed("status"):
+            event_type = (
+                IssueEvent.EventType.RESOLVED
+                if self.status == self.IssueStatus.RESOLVED
+                else IssueEvent.EventType.STATUS_CHANGED
             )
-            email.attach_alternative(html_email, "text/html")
-            email.send()
-        except Exception as e:
-            # Log any errors that occur during email sending
-            logger.error(
-                f"Failed to send issue assignment email for issue '{self.title}':{e}"
+            events.append(
+                (event_type, {"status": self.status, "previous_status": self.get_initial_value("status")}, None)
             )
+        if (self._state.adding and self.assigned_to_id is not None) or (
+            not self._state.adding and self.has_changed("assigned_to")
+        ):
+            previous = None if self._state.adding else self.get_initial_value("assigned_to")
+            events.append((IssueEvent.EventType.ASSIGNED, {}, previous))
+        return events
+
+    def notify_assigned_user(self) -> None:
+        # Queued after commit, rendered and sent by the send_notifications task
+        enqueue_notification("issue_assignment", issue_id=self.pkid)
+
+
+class EscalationRun(TimeStampedModel):
+    """
+    Timing and outcome of one SLA escalation run.
+    """
+
+    duration = models.FloatField(verbose_name=_("Duration (s)"))
+    batches = models.PositiveIntegerField(verbose_name=_("Batches"), default=0)
+    escalated_count = models.PositiveIntegerField(verbose_name=_("Escalated issues"), default=0)
+    breached_count = models.PositiveIntegerField(verbose_name=_("Breached issues"), default=0)
+    hit_batch_limit = models.BooleanField(
+        verbose_name=_("Stopped at the batch limit"), default=False
+    )
+
+    class Meta(TimeStampedModel.Meta):
+        verbose_name = _("Escalation run")
+        verbose_name_plural = _("Escalation runs")
 
+    def __str__(self) -> str:
+        return f"{self.created_at:%Y-%m-%d %H:%M} {self.escalated_count} escalated, {self.breached_count} breached"
+
+
+class CurrentTransactionId(RawSQL):
+    # Id of the transaction running the INSERT (PostgreSQL 13+)
+    def __init__(self):
+        super().__init__("pg_current_xact_id()::text::bigint", [], output_field=models.BigIntegerField())
+
+
+class IssueEvent(models.Model):
+    """
+    Append-only log of issue changes, read incrementally by the changefeed.
+
+    The users who may read an event are copied onto it so a feed read is an
+    index range scan on the user and the (transaction_id, pkid) position.
+    """
+
+    class EventType(models.TextChoices):
+        CREATED = ("created", _("Created"))
+        ASSIGNED = ("assigned", _("Assigned"))
+        STATUS_CHANGED = ("status_changed", _("Status changed"))
+        RESOLVED = ("resolved", _("Resolved"))
+
+    pkid = models.BigAutoField(primary_key=True, editable=False)
+    issue = models.ForeignKey(
+        Issue, on_delete=models.CASCADE, related_name="events", verbose_name=_("Issue")
+    )
+    event_type = models.CharField(
+        max_length=20, choices=EventType.choices, verbose_name=_("Event Type")
+    )
+    reported_by = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+", verbose_name=_("Reported by")
+    )
+    assigned_to = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name="+", verbose_name=_("Assigned to")
+    )
+    previous_assigned_to = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        verbose_name=_("Previously assigned to"),
+    )
+    data = models.JSONField(verbose_name=_("Data"), default=dict)
+    # Id of the writing transaction, events are only served once it is older
+    # than every running transaction (see changefeed.read_events)
+    transaction_id = models.BigIntegerField(
+        verbose_name=_("Transaction Id"), default=CurrentTransactionId
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Issue event")
+        verbose_name_plural = _("Issue events")
+        ordering = ["transaction_id", "pkid"]
+        indexes = [
+            models.Index(
+                fields=["reported_by", "transaction_id", "pkid"], name="issue_event_reporter_idx"
+            ),
+            models.Index(
+                fields=["assigned_to", "transaction_id", "pkid"], name="issue_event_assignee_idx"
+            ),
+            models.Index(
+                fields=["previous_assigned_to", "transaction_id", "pkid"],
+                condition=models.Q(previous_assigned_to__isnull=False),
+                name="issue_event_prev_assignee_idx",
+            ),
+            models.Index(fields=["created_at"], name="issue_event_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_type} {self.issue_id}"
+
+    @classmethod
+    def record(cls, issue: Issue, events: list) -> None:
+        """
+        Appends (event_type, data, previous assignee id) events of an issue.
+        """
+        cls.objects.bulk_create(
+            cls(
+                issue=issue,
+                event_type=event_type,
+                reported_by_id=issue.reported_by_id,
+                assigned_to_id=issue.assigned_to_id,
+                previous_assigned_to_id=previous_assigned_to,
+                data=data,
+            )
+            for event_type, data, previous_assigned_to in events
+        )
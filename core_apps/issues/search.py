@@ -0,0 +1,27 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from .models import Issue
+
+
+def search_issues(text: str, status: str = None, priority: str = None, building: str = None):
+    """
+    Issues matching the web search style `text` ("quoted phrases", or, -not),
+    annotated with their `rank`, title matches weighing more than description
+    matches.
+
+    Matches come from the GIN index on search_vector and only matching rows
+    are ranked; the optional filters are applied to those rows.
+    """
+    query = SearchQuery(text, config=Issue.SEARCH_CONFIG, search_type="websearch")
+    queryset = Issue.objects.filter(search_vector=query)
+    if status:
+        queryset = queryset.filter(status=status)
+    if priority:
+        queryset = queryset.filter(priority=priority)
+    if building:
+        queryset = queryset.filter(apartment__building=building)
+    # ts_rank() is a real: as a double precision the rank read back by a
+    # pagination cursor compares equal to the one computed by the next query
+    return queryset.annotate(rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
@@ -0,0 +1,60 @@
+import logging
+
+from datetime import timedelta
+from typing import List
+
+from celery import shared_task
+from django.utils import timezone
+
+from .models import Issue, IssueEvent
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="reconcile_issue_view_counts")
+def reconcile_issue_view_counts() -> int:
+    corrected = Issue.refresh_view_counts()
+    if corrected:
+        logger.warning(f"Corrected the view count of {corrected} issue(s)")
+    return corrected
+
+
+@shared_task(name="assign_issue_backlog")
+def assign_issue_backlog() -> int:
+    from .assignment import assign_backlog
+
+    return assign_backlog()
+
+
+@shared_task(name="auto_assign_issues")
+def auto_assign_issues(pkids: List[int]) -> int:
+    from .assignment import assign_new_issues
+
+    return assign_new_issues(pkids)
+
+
+@shared_task(name="escalate_overdue_issues")
+def escalate_overdue_issues() -> dict:
+    from .escalation import escalate_overdue_issues as run_escalation
+
+    run = run_escalation()
+    return {
+        "escalated": run.escalated_count,
+        "breached": run.breached_count,
+        "batches": run.batches,
+        "duration": run.duration,
+    }
+
+
+@shared_task(name="prune_issue_events")
+def prune_issue_events(retention_days: int = 30, batch_size: int = 10000) -> int:
+    # Clients that fall further behind than the retention restart from the head of the feed
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted = 0
+    while True:
+        pkids = list(
+            IssueEvent.objects.filter(created_at__lt=cutoff).values_list("pkid", flat=True)[:batch_size]
+        )
+        if not pkids:
+            return deleted
+        deleted += IssueEvent.objects.filter(pkid__in=pkids).delete()[0]
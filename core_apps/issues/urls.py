@@ -8,6 +8,9 @@ from .views import (
     MyIssuesListAPIView,
     IssueDetailAPIView,
     AssignedIssuesListView,
+    IssueChangesAPIView,
+    IssueSearchAPIView,
+    issue_changes_stream,
 )
 
 
@@ -15,6 +18,9 @@ urlpatterns = [
     path("", IssueListAPIView.as_view(), name="issue-list"),
     path("me/", MyIssuesListAPIView.as_view(), name="my-issue-list"),
     path("assigned/", AssignedIssuesListView.as_view(), name="assigned-issues"),
+    path("search/", IssueSearchAPIView.as_view(), name="issue-search"),
+    path("changes/", IssueChangesAPIView.as_view(), name="issue-changes"),
+    path("changes/stream/", issue_changes_stream, name="issue-changes-stream"),
     path(
         "apartments/<uuid:apartment_id>/", IssueCreateAPIView.as_view(), name="create-issue"
     ),
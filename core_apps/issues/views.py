@@ -1,22 +1,37 @@
+import asyncio
+import json
 import logging
+import time
 from typing import Any
 
-from django.http import Http404
-from django.utils import timezone
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from rest_framework import generics, permissions, status
-from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied, ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
-from django.contrib.contenttypes.models import ContentType
+from rest_framework.views import APIView
 
 from core_apps.apartments.models import Apartment  # Import Apartment model for apartment-related logic
-from core_apps.common.models import ContentView  # Import ContentView model for view tracking
+from core_apps.common.view_buffer import buffer_view  # Import write-behind buffer for view tracking
+from core_apps.common.conditional import ConditionalGetMixin  # Import ETag / Last-Modified support
+from core_apps.common.export import StreamingExportMixin  # Import the NDJSON/CSV export mode
+from core_apps.common.cookie_auth import CookieAuthentication  # Import the API authentication, reused by the SSE stream
+from core_apps.common.pagination import RankedKeysetPagination  # Import cursor pagination for ranked results
 from core_apps.common.renderers import GenericJSONRenderer  # Import custom renderer for JSON responses
+from .changefeed import InvalidCursor, format_cursor, head_cursor, parse_cursor, read_events  # Import the changefeed reader
 from .emails import send_issue_confirmation_email, send_issue_resolved_email  # Import email functions
 from .models import Issue  # Import Issue model
+from .search import search_issues  # Import the full-text search query
 from .serializers import IssueSerializer, IssueStatusUpdateSerializer  # Import serializers
+from .tasks import auto_assign_issues  # Import the automatic assignment task
 
 logger = logging.getLogger(__name__)  # Set up a logger for error tracking
+User = get_user_model()
 
 # Define a custom permission class to restrict access to staff and superusers
 class IsStaffOrSuperUser(permissions.BasePermission):
@@ -37,14 +52,40 @@ class IsStaffOrSuperUser(permissions.BasePermission):
 
 
 # API View for listing all issues (staff and superusers only)
-class IssueListAPIView(generics.ListAPIView):
-    queryset = Issue.objects.all()
+class IssueListAPIView(StreamingExportMixin, generics.ListAPIView):
+    queryset = Issue.objects.select_related("apartment", "reported_by", "assigned_to")
     serializer_class = IssueSerializer
     renderer_classes = [GenericJSONRenderer]
     permission_classes = [IsStaffOrSuperUser]
     object_label = "issues"
 
 
+# API View for full-text search over issues (staff and superusers only)
+class IssueSearchAPIView(generics.ListAPIView):
+    serializer_class = IssueSerializer
+    renderer_classes = [GenericJSONRenderer]
+    permission_classes = [IsStaffOrSuperUser]
+    pagination_class = RankedKeysetPagination
+    object_label = "issues"
+
+    def get_queryset(self):
+        params = self.request.query_params
+        text = params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": "A search query is required."})
+
+        status_filter = params.get("status")
+        if status_filter and status_filter not in Issue.IssueStatus.values:
+            raise ValidationError({"status": f"Must be one of {', '.join(Issue.IssueStatus.values)}."})
+        priority = params.get("priority")
+        if priority and priority not in Issue.Priority.values:
+            raise ValidationError({"priority": f"Must be one of {', '.join(Issue.Priority.values)}."})
+
+        return search_issues(
+            text, status=status_filter, priority=priority, building=params.get("building")
+        ).select_related("apartment", "reported_by", "assigned_to")
+
+
 # API View for listing issues assigned to the current user
 class AssignedIssuesListView(generics.ListAPIView):
     serializer_class = IssueSerializer
@@ -53,19 +94,21 @@ class AssignedIssuesListView(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        return Issue.objects.filter(assigned_to=user)
+        return Issue.objects.select_related("apartment", "reported_by", "assigned_to").filter(assigned_to=user)
 
 
 # API View for listing issues reported by the current user
-class MyIssuesListAPIView(generics.ListAPIView):
+class MyIssuesListAPIView(ConditionalGetMixin, generics.ListAPIView):
     queryset = Issue.objects.all()
     serializer_class = IssueSerializer
     renderer_classes = [GenericJSONRenderer]
     object_label = "my_issues"
+    # Unit numbers and user names are serialized along with each issue
+    etag_dependencies = [Apartment, User]
 
     def get_queryset(self):
         user = self.request.user
-        return Issue.objects.filter(reported_by=user)
+        return Issue.objects.select_related("apartment", "reported_by", "assigned_to").filter(reported_by=user)
 
 
 # API View for creating a new issue
@@ -95,10 +138,14 @@ class IssueCreateAPIView(generics.CreateAPIView):
 
         send_issue_confirmation_email(issue)  # Send a confirmation email to the user
 
+        if issue.category:
+            # Picked by the assignment engine in a worker, once the issue is committed
+            transaction.on_commit(lambda: auto_assign_issues.delay([issue.pkid]))
+
 
 # API View for retrieving an issue by ID
 class IssueDetailAPIView(generics.RetrieveAPIView):
-    queryset = Issue.objects.all()
+    queryset = Issue.objects.select_related("apartment", "reported_by", "assigned_to")
     serializer_class = IssueSerializer
     lookup_field = "id"
     renderer_classes = [GenericJSONRenderer]
@@ -115,19 +162,10 @@ class IssueDetailAPIView(generics.RetrieveAPIView):
         self.record_issue_view(issue)  # Record the view for this issue
         return issue
 
-    # Method to record the issue view in the ContentView model
+    # Method to record the issue view, buffered and written to ContentView by the flush_content_views task
     def record_issue_view(self, issue):
-        content_type = ContentType.objects.get_for_model(issue)
         viewer_ip = self.get_client_ip()  # Get the client's IP address
-        user = self.request.user
-
-        obj, created = ContentView.objects.update_or_create(
-            content_type=content_type,
-            object_id=issue.pk,
-            user=user,
-            viewer_ip=viewer_ip,
-            defaults={"last_viewed": timezone.now()},
-        )  # Create or update the ContentView record
+        buffer_view(issue, self.request.user, viewer_ip)
 
     # Helper method to get the client's IP address
     def get_client_ip(self) -> str:
@@ -191,4 +229,90 @@ class IssueDeleteAPIView(generics.DestroyAPIView):
 
     def delete(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         super().delete(request, *args, **kwargs)
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# API View returning the issue events of the current user since a cursor. It
+# answers at once: holding the request would pin a WSGI worker, clients that
+# want events pushed use the SSE stream below
+class IssueChangesAPIView(APIView):
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "changes"
+
+    def get(self, request: Request) -> Response:
+        since = request.query_params.get("since")
+        if not since:
+            # First call: the client starts from the current head of the feed
+            return Response({"cursor": format_cursor(head_cursor()), "events": [], "has_more": False})
+        try:
+            cursor = parse_cursor(since)
+        except InvalidCursor:
+            return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        events, cursor, has_more = read_events(request.user, cursor)
+        return Response({"cursor": format_cursor(cursor), "events": events, "has_more": has_more})
+
+
+def format_sse_event(event: dict) -> str:
+    return f"id: {event['cursor']}\nevent: {event['event_type']}\ndata: {json.dumps(event)}\n\n"
+
+
+# Server-Sent Events version of the changefeed. Served by backend/asgi.py the
+# connection stays open and events are pushed as they arrive. Under WSGI a held
+# connection would pin a worker thread for minutes and its output would be
+# buffered, so the events available now are sent in one response and
+# EventSource reconnects after SSE_RETRY_MS with its Last-Event-ID.
+SSE_RETRY_MS = 5000
+
+
+async def issue_changes_stream(request: HttpRequest) -> HttpResponse:
+    try:
+        authenticated = await sync_to_async(CookieAuthentication().authenticate)(request)
+    except AuthenticationFailed:
+        authenticated = None
+    if authenticated is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    user = authenticated[0]
+
+    # EventSource sends the id of the last received event when it reconnects
+    since = request.headers.get("Last-Event-ID") or request.GET.get("since")
+    try:
+        cursor = parse_cursor(since) if since else await sync_to_async(head_cursor)()
+    except InvalidCursor:
+        return JsonResponse({"detail": "Invalid cursor."}, status=400)
+
+    # An id without data only sets Last-Event-ID, so a client that started from
+    # the head resumes from there even when it received no event
+    preamble = f"retry: {SSE_RETRY_MS}\nid: {format_cursor(cursor)}\n\n"
+
+    if not isinstance(request, ASGIRequest):
+        events, cursor, _ = await sync_to_async(read_events)(user, cursor)
+        response = HttpResponse(
+            preamble + "".join(format_sse_event(event) for event in events),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    async def stream():
+        nonlocal cursor
+        yield preamble
+        # Connections are closed after a while, the client reconnects from its cursor
+        deadline = time.monotonic() + 300
+        idle_since = time.monotonic()
+        while time.monotonic() < deadline:
+            events, cursor, has_more = await sync_to_async(read_events)(user, cursor)
+            for event in events:
+                yield format_sse_event(event)
+            if events:
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since > 15:
+                yield ": keep-alive\n\n"
+                idle_since = time.monotonic()
+            if not has_more:
+                await asyncio.sleep(1)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
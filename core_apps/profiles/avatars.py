@@ -0,0 +1,112 @@
+import io
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.utils.module_loading import import_string
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+SPOOL_DIR = "avatars/spool"
+
+# variant name -> longest side in pixels, "avatar" is the main image
+AVATAR_VARIANTS = {
+    "avatar": 512,
+    "medium": 256,
+    "thumbnail": 96,
+}
+
+
+def spool_avatar(profile_id, upload: UploadedFile) -> str:
+    """
+    Writes an uploaded image to storage chunk by chunk and returns its name.
+    Only this name goes through the broker, never the image bytes.
+    """
+    extension = os.path.splitext(upload.name)[1].lower()
+    return default_storage.save(f"{SPOOL_DIR}/{profile_id}/{uuid.uuid4().hex}{extension}", upload)
+
+
+def render_variants(source: bytes) -> Dict[str, bytes]:
+    """
+    Resizes an image to every AVATAR_VARIANTS size, as JPEG. Raises
+    PIL.UnidentifiedImageError when the source is not an image.
+    """
+    with Image.open(io.BytesIO(source)) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        variants = {}
+        for name, size in AVATAR_VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail((size, size))
+            output = io.BytesIO()
+            resized.save(output, format="JPEG", quality=85, optimize=True)
+            variants[name] = output.getvalue()
+    return variants
+
+
+@lru_cache(maxsize=None)
+def _get_process_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=settings.AVATAR_PROCESS_POOL_SIZE)
+
+
+def render_variants_in_pool(source: bytes) -> Dict[str, bytes]:
+    # Resizing is CPU bound, it runs outside the worker process so that it
+    # does not hold the GIL. Daemonic processes (the prefork pool children)
+    # cannot start processes of their own and resize inline instead.
+    if not settings.AVATAR_PROCESS_POOL_SIZE or multiprocessing.current_process().daemon:
+        return render_variants(source)
+    return _get_process_pool().submit(render_variants, source).result()
+
+
+class CloudinaryAvatarBackend:
+    def save(self, profile_id, variant: str, content: bytes) -> Tuple[str, str]:
+        """
+        Stores one variant and returns its CloudinaryField reference and URL.
+        """
+        from cloudinary import uploader
+
+        response = uploader.upload(
+            content,
+            public_id=f"avatars/{profile_id}/{variant}",
+            overwrite=True,
+            resource_type="image",
+        )
+        reference = f"image/upload/v{response['version']}/{response['public_id']}.{response['format']}"
+        return reference, response["secure_url"]
+
+    @lru_cache(maxsize=4096)
+    def url(self, public_id: str, version: str | None, format: str | None) -> str:
+        # Building a Cloudinary URL is pure string work, identical for a given
+        # resource, so each avatar is only built once per process
+        from cloudinary import CloudinaryResource
+
+        return CloudinaryResource(public_id, format=format, version=version).url
+
+
+class LocalAvatarBackend:
+    """
+    Keeps avatars in the default storage (MEDIA_ROOT), stands in for
+    Cloudinary in tests and in development without credentials.
+    """
+
+    def save(self, profile_id, variant: str, content: bytes) -> Tuple[str, str]:
+        name = f"avatars/{profile_id}/{variant}.jpg"
+        default_storage.delete(name)
+        name = default_storage.save(name, ContentFile(content))
+        return name, default_storage.url(name)
+
+    def url(self, public_id: str, version: str | None, format: str | None) -> str:
+        return default_storage.url(f"{public_id}.{format}" if format else public_id)
+
+
+@lru_cache(maxsize=None)
+def get_avatar_backend():
+    return import_string(settings.AVATAR_BACKEND)()
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="avatar_variants",
+            field=models.JSONField(
+                blank=True, default=dict, editable=False, verbose_name="Avatar Variants"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0002_profile_avatar_variants"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
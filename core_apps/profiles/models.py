@@ -1,13 +1,18 @@
+from typing import Optional
+
 from autoslug import AutoSlugField
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
 from phonenumber_field.modelfields import PhoneNumberField
-from django.db.models import Avg
+from django.db.models import F, Value
+from django.db.models.functions import Greatest, Now
 from cloudinary.models import CloudinaryField
 
 from core_apps.common.models import TimeStampedModel
+from core_apps.common.response_cache import invalidate_responses
 
 User = get_user_model()
 
@@ -15,6 +20,15 @@ def get_user_username(instance: "Profile") -> str:
     return instance.user.username
 
 
+def refresh_rankings_on_commit(user_ids) -> None:
+    # Technician rankings weigh the reputation. Imported here because the
+    # ratings app depends on this one.
+    from core_apps.ratings.tasks import refresh_technician_rankings
+
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: refresh_technician_rankings.delay(user_ids))
+
+
 class Profile(TimeStampedModel):
     class Gender(models.TextChoices):
         MALE = (
@@ -86,6 +100,13 @@ class Profile(TimeStampedModel):
     city_of_origin = models.CharField(
         verbose_name=_("City"), max_length=180, default="Lome"
     )
+    avatar_variants = models.JSONField(
+        verbose_name=_("Avatar Variants"), default=dict, blank=True, editable=False
+    )
+    # Reputation starts at REPUTATION_MAX and loses REPORT_PENALTY per report, down to 0
+    REPUTATION_MAX = 100
+    REPORT_PENALTY = 20
+
     report_count = models.IntegerField(verbose_name=_("Report Count"), default=0)
     reputation = models.IntegerField(verbose_name=_("Reputation"), default=100)
     slug = AutoSlugField(populate_from=get_user_username, unique=True)
@@ -98,12 +119,43 @@ class Profile(TimeStampedModel):
         return self.report_count >= 5
 
     def update_reputation(self):
-        self.reputation = max(0, 100 - self.report_count * 20)
+        self.reputation = max(0, self.REPUTATION_MAX - self.report_count * self.REPORT_PENALTY)
+
+    @classmethod
+    def reputation_expression(cls, report_count=F("report_count")):
+        # Same rule as update_reputation(), evaluated by the database
+        return Greatest(Value(0), Value(cls.REPUTATION_MAX) - report_count * cls.REPORT_PENALTY)
+
+    @classmethod
+    def record_report(cls, user_pkid: int) -> Optional[int]:
+        """
+        Increments the report count of a user's profile and updates its
+        reputation in a single UPDATE, then reads the new count back under
+        the row lock the UPDATE took. Returns the new report count, or None
+        when the user has no profile.
+        """
+        profile = cls.objects.filter(user_id=user_pkid)
+        with transaction.atomic():
+            # SET expressions see the row before the update, hence the + 1 in both
+            updated = profile.update(
+                report_count=F("report_count") + 1,
+                reputation=cls.reputation_expression(F("report_count") + 1),
+                updated_at=Now(),
+            )
+            if not updated:
+                return None
+            report_count = profile.values_list("report_count", flat=True).get()
+        invalidate_responses(cls)
+        refresh_rankings_on_commit([user_pkid])
+        return report_count
 
     def save(self, *args, **kwargs):
         self.update_reputation()
         super().save(*args, **kwargs)
 
     def get_average_rating(self):
-        average = self.user.received_ratings.aggregate(Avg("rating"))["rating__avg"]
-        return average if average is not None else 0.0
\ No newline at end of file
+        # Read from the maintained summary, select_related("user__rating_summary") avoids the query
+        try:
+            return self.user.rating_summary.average
+        except ObjectDoesNotExist:
+            return 0.0
\ No newline at end of file
@@ -3,9 +3,11 @@ from django.contrib.auth import get_user_model
 from .models import Profile
 from django_countries.serializer_fields import  CountryField
 from core_apps.apartments.serializers import ApartmentSerializer
+from .avatars import get_avatar_backend
 
 User = get_user_model()
 
+
 class ProfileSerializer(serializers.ModelSerializer):
     first_name = serializers.ReadOnlyField(source="user.first_name")
     last_name = serializers.ReadOnlyField(source="user.last_name")
@@ -15,6 +17,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     avatar = serializers.SerializerMethodField()
     date_joined = serializers.DateTimeField(source="user.date_joined", read_only=True)
     apartments = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(source="get_average_rating", read_only=True)
 
     class Meta:
         model = Profile
@@ -33,15 +36,16 @@ class ProfileSerializer(serializers.ModelSerializer):
             "reputation",
             "date_joined",
             "avatar",
+            "avatar_variants",
             "apartments",
-            # "average_rating",
+            "average_rating",
         ]
 
     def get_avatar(self, obj:Profile)-> str | None:
-        try:
-            return obj.avatar.url
-        except AttributeError:
+        avatar = obj.avatar
+        if not getattr(avatar, "public_id", None):
             return None
+        return get_avatar_backend().url(avatar.public_id, avatar.version, avatar.format)
 
     def get_apartments(self, obj: Profile) -> list|None:
         apartments = obj.user.apartments.all()
@@ -70,7 +74,5 @@ class UpdateProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class AvatarUploadSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Profile
-        fields = ["avatar"]
+class AvatarUploadSerializer(serializers.Serializer):
+    avatar = serializers.ImageField(max_length=255)
@@ -2,10 +2,11 @@ import logging
 from typing import Any, Type
 
 from django.db.models.base import Model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from backend.settings.base import AUTH_USER_MODEL
+from core_apps.common.cookie_auth import forget_cached_user
 from core_apps.profiles.models import Profile
 
 logger = logging.getLogger(__name__)
@@ -21,4 +22,18 @@ def create_user_profile(
     else:
         logger.info(
             f"Profile already exists for {instance.first_name} {instance.last_name}"
-        )
\ No newline at end of file
+        )
+
+
+# Cached authentications carry the user and the profile, refresh them on every write
+@receiver(post_save, sender=AUTH_USER_MODEL)
+@receiver(post_delete, sender=AUTH_USER_MODEL)
+def forget_cached_user_on_user_change(sender: Type[Model], instance: Model, **kwargs: Any) -> None:
+    forget_cached_user(instance.id)
+
+
+@receiver(post_save, sender=Profile)
+def forget_cached_user_on_profile_change(
+    sender: Type[Model], instance: Profile, **kwargs: Any
+) -> None:
+    forget_cached_user(instance.user.id)
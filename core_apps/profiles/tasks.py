@@ -1,19 +1,89 @@
+import logging
 from uuid import UUID
 from celery import shared_task
-from .models import Profile
-from cloudinary import uploader
+from cloudinary.exceptions import Error as CloudinaryError
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max, Min
+from PIL import UnidentifiedImageError
+from core_apps.common.response_cache import invalidate_responses
+from .avatars import get_avatar_backend, render_variants_in_pool
+from .models import Profile, refresh_rankings_on_commit
 
+logger = logging.getLogger(__name__)
 
-@shared_task(name="upload_avatar_to_cloudinary")
-def upload_avatar_to_cloudinary(profile_id: UUID, image_content: bytes) -> None:
-    profile = Profile.objects.get(id=profile_id)
-    response = uploader.upload(image_content)
-    profile.avatar = response["url"]
-    profile.save()
+
+@shared_task(
+    name="process_avatar_upload",
+    rate_limit="30/m",
+    autoretry_for=(OSError, CloudinaryError),
+    retry_backoff=True,
+    max_retries=5,
+)
+def process_avatar_upload(profile_id: UUID, spooled_name: str) -> bool:
+    """
+    Resizes a spooled avatar into every variant, stores them with the avatar
+    backend and points the profile at them. The spooled file is removed once
+    it has been handled, it is kept while the task is retried.
+    """
+    if not Profile.objects.filter(id=profile_id).exists():
+        default_storage.delete(spooled_name)
+        return False
+
+    with default_storage.open(spooled_name, "rb") as spooled:
+        source = spooled.read()
+
+    try:
+        variants = render_variants_in_pool(source)
+    except UnidentifiedImageError:
+        logger.warning(f"Avatar upload {spooled_name} is not a readable image, discarded")
+        default_storage.delete(spooled_name)
+        return False
+
+    backend = get_avatar_backend()
+    avatar, urls = None, {}
+    for variant, content in variants.items():
+        reference, urls[variant] = backend.save(profile_id, variant, content)
+        if variant == "avatar":
+            avatar = reference
+
+    # Only the avatar columns are written, a concurrent profile update is kept
+    Profile.objects.filter(id=profile_id).update(avatar=avatar, avatar_variants=urls)
+    invalidate_responses(Profile)
+    default_storage.delete(spooled_name)
+    return True
 
 
 @shared_task(name="update_reputation_score")
-def update_reputation_score():
-    for profile in Profile.objects.all():
-        profile.update_reputation()
-        profile.save()
\ No newline at end of file
+def update_reputation_score(chunk_size: int = 10000) -> dict:
+    """
+    Recomputes every reputation in SQL, one primary key range at a time.
+
+    Each chunk reads the users whose stored value differs from the rule, then
+    runs a single UPDATE on them, so unchanged profiles are never rewritten
+    and only the changed users get their ranking refreshed. The new value
+    is computed from the row being updated, which keeps it correct when a
+    report increments report_count concurrently.
+    """
+    bounds = Profile.objects.aggregate(first=Min("pkid"), last=Max("pkid"), scanned=Count("pkid"))
+    changed = 0
+
+    if bounds["scanned"]:
+        expected = Profile.reputation_expression()
+        for start in range(bounds["first"], bounds["last"] + 1, chunk_size):
+            stale = list(
+                Profile.objects.filter(pkid__gte=start, pkid__lt=start + chunk_size)
+                .exclude(reputation=expected)
+                .values_list("user_id", flat=True)
+            )
+            if stale:
+                changed += (
+                    Profile.objects.filter(user_id__in=stale)
+                    .exclude(reputation=expected)
+                    .update(reputation=expected)
+                )
+                refresh_rankings_on_commit(stale)
+
+    if changed:
+        invalidate_responses(Profile)
+    logger.info(f"Reputation update: {bounds['scanned']} profile(s) scanned, {changed} changed")
+    return {"scanned": bounds["scanned"], "changed": changed}
@@ -0,0 +1,91 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from core_apps.apartments.models import Apartment
+from core_apps.common.testing import assert_within_query_budget
+from core_apps.ratings.models import Rating
+
+from .models import Profile
+from .views import NonTenantProfileListAPIView, ProfileListAPIView
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+def make_users(count: int, occupation: str, prefix: str) -> list:
+    """
+    Creates users whose profile has `occupation`, each with an apartment and
+    a rating so that every relation the serializer reads is populated.
+    """
+    # Staff profiles are left out of both lists
+    rater = User.objects.create_user(
+        username=f"{prefix}-rater",
+        email=f"{prefix}-rater@example.com",
+        password="pass1234!",
+        is_staff=True,
+    )
+    users = []
+    for number in range(count):
+        user = User.objects.create_user(
+            username=f"{prefix}{number}",
+            email=f"{prefix}{number}@example.com",
+            password="pass1234!",
+            first_name="First",
+            last_name=f"Last{number}",
+        )
+        Profile.objects.filter(user=user).update(occupation=occupation)
+        Apartment.objects.create(
+            unit_number=f"{prefix[:4]}{number}", building="A", floor=number, tenant=user
+        )
+        Rating.objects.create(rated_user=user, rating_user=rater, rating=4)
+        users.append(user)
+    return users
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    cache.clear()
+    admin = User.objects.create_superuser(
+        username="admin", email="admin@example.com", password="pass1234!"
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+def get_page(client: APIClient, url: str, view_class) -> dict:
+    # Cached responses skip the database, the budget is checked on a miss
+    cache.clear()
+    with assert_within_query_budget(view_class):
+        response = client.get(url, {"page_size": 100})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("count", [1, 25])
+def test_profile_list_stays_within_query_budget(api_client, count):
+    make_users(count, Profile.Occupation.TENANT, "tenant")
+    make_users(2, Profile.Occupation.Plumber, "plumber")
+
+    data = get_page(api_client, "/api/v1/profiles/", ProfileListAPIView)["profiles"]
+
+    assert data["count"] == count
+    assert all(profile["occupation"] == Profile.Occupation.TENANT for profile in data["results"])
+    assert all(len(profile["apartments"]) == 1 for profile in data["results"])
+
+
+@pytest.mark.parametrize("count", [1, 25])
+def test_non_tenant_profile_list_stays_within_query_budget(api_client, count):
+    make_users(count, Profile.Occupation.Plumber, "plumber")
+    make_users(2, Profile.Occupation.TENANT, "tenant")
+
+    data = get_page(
+        api_client, "/api/v1/profiles/non-tenant-profiles/", NonTenantProfileListAPIView
+    )["non_tenant_profiles"]
+
+    assert data["count"] == count
+    assert all(profile["occupation"] == Profile.Occupation.Plumber for profile in data["results"])
+    assert all(len(profile["apartments"]) == 1 for profile in data["results"])
@@ -1,56 +1,87 @@
 from typing import List
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models import QuerySet
 from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics
+from rest_framework import generics
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from core_apps.common.conditional import ConditionalGetMixin
+from core_apps.common.export import StreamingExportMixin
 from core_apps.common.renderers import GenericJSONRenderer
+from core_apps.common.response_cache import ResponseCacheMixin, invalidate_responses
+from core_apps.common.search import TrigramSearchFilter
+from core_apps.apartments.models import Apartment
+from core_apps.ratings.models import Rating
 from .models import Profile
 from .serializers import (
     AvatarUploadSerializer,
     ProfileSerializer,
     UpdateProfileSerializer,
 )
-from .tasks import upload_avatar_to_cloudinary
+from .avatars import spool_avatar
+from .tasks import process_avatar_upload
 from core_apps.common.pagination import StandardResultsSetPagination
 
 User = get_user_model()
 
+# Everything a serialized profile is built from, average rating included
+PROFILE_CACHE_DEPENDENCIES = [Profile, User, Apartment, Rating]
 
 
+def listed_profiles() -> QuerySet:
+    # User is joined and apartments are loaded in one extra query, so a page
+    # costs the same number of queries whatever its size
+    return (
+        Profile.objects.select_related("user__rating_summary")
+        .prefetch_related("user__apartments")
+        .exclude(user__is_staff=True)
+        .exclude(user__is_superuser=True)
+    )
 
-class ProfileListAPIView(generics.ListAPIView):
+
+class ProfileListAPIView(ResponseCacheMixin, StreamingExportMixin, generics.ListAPIView):
     serializer_class = ProfileSerializer
     renderer_classes = [GenericJSONRenderer]
     pagination_class = StandardResultsSetPagination
     object_label = "profiles"
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    search_fields = ["user__username", "user__first_name", "user__last_name"]
+    cache_dependencies = PROFILE_CACHE_DEPENDENCIES
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
+    search_fields = [f"user__{field}" for field in User.SEARCH_FIELDS]
     filterset_fields = ["occupation", "gender", "country_of_origin"]
+    # count + page + apartments, authentication excluded
+    query_budget = 3
 
     def get_queryset(self) -> List[Profile]:
-        return (
-            Profile.objects.exclude(user__is_staff=True)
-            .exclude(user__is_superuser=True)
-            .filter(occupation=Profile.Occupation.TENANT)
-        )
+        return listed_profiles().filter(occupation=Profile.Occupation.TENANT)
+
 
-class ProfileDetailAPIView(generics.RetrieveAPIView):
+class ProfileDetailAPIView(ConditionalGetMixin, ResponseCacheMixin, generics.RetrieveAPIView):
     serializer_class = ProfileSerializer
     renderer_classes = [GenericJSONRenderer]
     object_label = "profile"
+    cache_dependencies = PROFILE_CACHE_DEPENDENCIES
+    cache_per_user = True
+    # The profile row itself is probed
+    etag_dependencies = [User, Apartment, Rating]
 
     def get_queryset(self) -> QuerySet:
-        return Profile.objects.select_related("user").all()
+        return Profile.objects.select_related("user__rating_summary").all()
+
+    def get_conditional_queryset(self) -> QuerySet:
+        return Profile.objects.filter(user=self.request.user)
 
         # This method defines how to retrieve the specific object based on the request.
         # It fetches the profile associated with the current user (from request.user).
     def get_object(self) -> Profile:
         try:
-            return Profile.objects.get(user=self.request.user)
+            return (
+                self.get_queryset()
+                .prefetch_related("user__apartments")
+                .get(user=self.request.user)
+            )
         except Profile.DoesNotExist:
             raise Http404("Profile not found")
 
@@ -71,6 +102,7 @@ class ProfileUpdateAPIView(generics.UpdateAPIView):
         user_data = serializer.validated_data.pop("user", {})
         profile = serializer.save()
         User.objects.filter(id=self.request.user.id).update(**user_data)
+        invalidate_responses(User)
         return profile
 
 
@@ -80,14 +112,16 @@ class AvatarUploadView(APIView):
 
     def upload_avatar(self, request, *args, **kwargs):
         profile = request.user.profile
-        serializer = AvatarUploadSerializer(profile, data=request.data)
+        serializer = AvatarUploadSerializer(data=request.data)
 
         if serializer.is_valid():
             image = serializer.validated_data["avatar"]
 
-            image_content = image.read()
-
-            upload_avatar_to_cloudinary.delay(str(profile.id), image_content)
+            # The image is written to storage, only its name is sent to the worker
+            spooled_name = spool_avatar(profile.id, image)
+            transaction.on_commit(
+                lambda: process_avatar_upload.delay(str(profile.id), spooled_name)
+            )
 
             return Response(
                 {"message": "Avatar upload started."}, status=status.HTTP_202_ACCEPTED
@@ -95,18 +129,16 @@ class AvatarUploadView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class NonTenantProfileListAPIView(generics.ListAPIView):
+class NonTenantProfileListAPIView(ResponseCacheMixin, generics.ListAPIView):
     serializer_class = ProfileSerializer
     renderer_classes = [GenericJSONRenderer]
     pagination_class = StandardResultsSetPagination
     object_label = "non_tenant_profiles"
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    search_fields = ["user__username", "user__first_name", "user__last_name"]
+    cache_dependencies = PROFILE_CACHE_DEPENDENCIES
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
+    search_fields = [f"user__{field}" for field in User.SEARCH_FIELDS]
     filterset_fields = ["occupation", "gender", "country_of_origin"]
+    query_budget = 3
 
     def get_queryset(self) -> List[Profile]:
-        return (
-            Profile.objects.exclude(user__is_staff=True)
-            .exclude(user__is_superuser=True)
-            .exclude(occupation=Profile.Occupation.TENANT)
-        )
\ No newline at end of file
+        return listed_profiles().exclude(occupation=Profile.Occupation.TENANT)
\ No newline at end of file
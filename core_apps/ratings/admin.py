@@ -1,3 +1,27 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Rating, RatingSummary, TechnicianRanking
+
+
+@admin.register(Rating)
+class RatingAdmin(admin.ModelAdmin):
+    list_display = ["rated_user", "rating_user", "rating", "created_at"]
+    list_filter = ["rating"]
+    search_fields = ["rated_user__username", "rating_user__username"]
+    list_select_related = ["rated_user", "rating_user"]
+
+
+@admin.register(RatingSummary)
+class RatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ["user", "count", "total", "average"]
+    readonly_fields = ["user", "count", "total", "rating_1", "rating_2", "rating_3", "rating_4", "rating_5"]
+    list_select_related = ["user"]
+    search_fields = ["user__username"]
+
+
+@admin.register(TechnicianRanking)
+class TechnicianRankingAdmin(admin.ModelAdmin):
+    list_display = ["user", "occupation", "score", "average_rating", "rating_count", "reputation", "updated_at"]
+    list_filter = ["occupation"]
+    list_select_related = ["user"]
+    search_fields = ["user__username"]
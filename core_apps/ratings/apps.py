@@ -6,3 +6,6 @@ class RatingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.ratings"
     verbose_name = _("Ratings")
+
+    def ready(self):
+        import core_apps.ratings.signals  # noqa: F401
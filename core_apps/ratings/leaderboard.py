@@ -0,0 +1,115 @@
+import logging
+from itertools import islice
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet, Sum
+
+from core_apps.profiles.models import Profile
+
+from .models import RatingSummary, TechnicianRanking
+
+logger = logging.getLogger(__name__)
+
+# A technician starts with PRIOR_WEIGHT virtual ratings worth the mean rating
+# of all technicians, so a single 5/5 does not outrank fifty 4.8/5 ratings.
+PRIOR_WEIGHT = 5
+DEFAULT_PRIOR_MEAN = 3.0
+PRIOR_MEAN_CACHE_KEY = "ratings:technician_prior_mean"
+
+
+def technician_profiles() -> QuerySet:
+    return (
+        Profile.objects.exclude(occupation=Profile.Occupation.TENANT)
+        .exclude(user__is_staff=True)
+        .exclude(user__is_superuser=True)
+    )
+
+
+def compute_prior_mean() -> float:
+    totals = RatingSummary.objects.filter(
+        user__profile__in=technician_profiles()
+    ).aggregate(count=Sum("count"), total=Sum("total"))
+    prior_mean = totals["total"] / totals["count"] if totals["count"] else DEFAULT_PRIOR_MEAN
+    cache.set(PRIOR_MEAN_CACHE_KEY, prior_mean, timeout=None)
+    return prior_mean
+
+
+def get_prior_mean() -> float:
+    prior_mean = cache.get(PRIOR_MEAN_CACHE_KEY)
+    return prior_mean if prior_mean is not None else compute_prior_mean()
+
+
+def compute_score(rating_count: int, rating_total: int, reputation: int, prior_mean: float) -> float:
+    """
+    Bayesian average of the ratings, weighted by the reputation (0-100).
+    """
+    bayesian_average = (PRIOR_WEIGHT * prior_mean + rating_total) / (PRIOR_WEIGHT + rating_count)
+    return round(bayesian_average * reputation / 100, 4)
+
+
+def _upsert_rankings(profiles: QuerySet, prior_mean: float, batch_size: int) -> int:
+    rows = profiles.values_list(
+        "user_id",
+        "occupation",
+        "reputation",
+        "user__rating_summary__count",
+        "user__rating_summary__total",
+    ).iterator(chunk_size=batch_size)
+
+    written = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return written
+        rankings = []
+        for user_id, occupation, reputation, count, total in batch:
+            count, total = count or 0, total or 0
+            rankings.append(
+                TechnicianRanking(
+                    user_id=user_id,
+                    occupation=occupation,
+                    score=compute_score(count, total, reputation, prior_mean),
+                    average_rating=round(total / count, 2) if count else 0.0,
+                    rating_count=count,
+                    reputation=reputation,
+                )
+            )
+        TechnicianRanking.objects.bulk_create(
+            rankings,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["occupation", "score", "average_rating", "rating_count", "reputation", "updated_at"],
+        )
+        written += len(rankings)
+
+
+def rebuild_rankings(batch_size: int = 1000) -> int:
+    """
+    Recomputes the whole ranking table: the prior mean, then one upsert per
+    batch of technicians. Rows of users who are no longer technicians go.
+
+    Each batch commits on its own. A transaction spanning the whole rebuild
+    would hold back the issue changefeed until it ends, see issues/changefeed.py.
+    """
+    prior_mean = compute_prior_mean()
+    written = _upsert_rankings(technician_profiles(), prior_mean, batch_size)
+    TechnicianRanking.objects.exclude(user__profile__in=technician_profiles()).delete()
+    logger.info(f"Technician rankings rebuilt: {written} row(s), prior mean {prior_mean:.2f}")
+    return written
+
+
+def refresh_rankings(user_ids: Iterable[int], prior_mean: Optional[float] = None) -> int:
+    """
+    Recomputes the ranking rows of a few users with the current prior mean.
+    """
+    user_ids = set(user_ids)
+    if prior_mean is None:
+        prior_mean = get_prior_mean()
+    with transaction.atomic():
+        written = _upsert_rankings(technician_profiles().filter(user_id__in=user_ids), prior_mean, len(user_ids) or 1)
+        TechnicianRanking.objects.filter(user_id__in=user_ids).exclude(
+            user__profile__in=technician_profiles()
+        ).delete()
+    return written
@@ -0,0 +1,115 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("users", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RatingSummary",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating_summary",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Number of ratings"
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Sum of ratings"
+                    ),
+                ),
+                ("rating_1", models.PositiveIntegerField(default=0)),
+                ("rating_2", models.PositiveIntegerField(default=0)),
+                ("rating_3", models.PositiveIntegerField(default=0)),
+                ("rating_4", models.PositiveIntegerField(default=0)),
+                ("rating_5", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Rating summary",
+                "verbose_name_plural": "Rating summaries",
+            },
+        ),
+        migrations.CreateModel(
+            name="Rating",
+            fields=[
+                (
+                    "pkid",
+                    models.BigAutoField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "rating",
+                    models.IntegerField(
+                        choices=[
+                            (1, "Very Poor"),
+                            (2, "Poor"),
+                            (3, "Average"),
+                            (4, "Good"),
+                            (5, "Excellent"),
+                        ],
+                        verbose_name="Rating",
+                    ),
+                ),
+                ("comment", models.TextField(blank=True, verbose_name="Comment")),
+                (
+                    "rated_user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="received_ratings",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Rated User",
+                    ),
+                ),
+                (
+                    "rating_user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="given_ratings",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Rating User",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rating",
+                "verbose_name_plural": "Ratings",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="rating",
+            constraint=models.UniqueConstraint(
+                fields=("rated_user", "rating_user"), name="unique_rating_per_user_pair"
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+        ("ratings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TechnicianRanking",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="technician_ranking",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+                (
+                    "occupation",
+                    models.CharField(
+                        choices=[
+                            ("mason", "Mason"),
+                            ("carpenter", "Carpenter"),
+                            ("plumber", "Plumber"),
+                            ("roofer", "Roofer"),
+                            ("painter", "Painter"),
+                            ("electrician", "Electrician"),
+                            ("hvac", "HVAC"),
+                            ("tenant", "Tenant"),
+                        ],
+                        max_length=20,
+                        verbose_name="Occupation",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Score")),
+                ("average_rating", models.FloatField(verbose_name="Average rating")),
+                (
+                    "rating_count",
+                    models.PositiveIntegerField(verbose_name="Number of ratings"),
+                ),
+                ("reputation", models.IntegerField(verbose_name="Reputation")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Technician ranking",
+                "verbose_name_plural": "Technician rankings",
+                "ordering": ["occupation", "-score", "user_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["occupation", "-score", "user"],
+                        name="ranking_occupation_score_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from core_apps.common.models import TimeStampedModel
+from core_apps.profiles.models import Profile
 
 User = get_user_model()
 
@@ -37,4 +39,100 @@ class Rating(TimeStampedModel):
 
     class Meta:
         verbose_name = _("Rating")
-        verbose_name_plural = _("Ratings")
\ No newline at end of file
+        verbose_name_plural = _("Ratings")
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["rated_user", "rating_user"], name="unique_rating_per_user_pair"
+            ),
+        ]
+
+
+class RatingSummary(models.Model):
+    """
+    Running totals of the ratings received by a user, kept up to date by the
+    Rating signals so that averages never need an aggregate query.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_summary",
+        verbose_name=_("User"),
+    )
+    count = models.PositiveIntegerField(verbose_name=_("Number of ratings"), default=0)
+    total = models.PositiveIntegerField(verbose_name=_("Sum of ratings"), default=0)
+    # Histogram, one counter per RatingChoices value
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Rating summary")
+        verbose_name_plural = _("Rating summaries")
+
+    def __str__(self) -> str:
+        return f"{self.user} {self.average:.2f}/5 ({self.count})"
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def histogram(self) -> dict:
+        return {value: getattr(self, f"rating_{value}") for value in Rating.RatingChoices.values}
+
+    @classmethod
+    def apply(cls, user_id: int, rating: int, sign: int) -> None:
+        """
+        Adds (sign=1) or removes (sign=-1) one rating from a user's summary with
+        a single relative UPDATE, safe against concurrent writers. A missing
+        summary is only created when adding: there is nothing to remove from.
+        """
+        changes = {
+            "count": F("count") + sign,
+            "total": F("total") + sign * rating,
+            f"rating_{rating}": F(f"rating_{rating}") + sign,
+        }
+        if not cls.objects.filter(user_id=user_id).update(**changes) and sign > 0:
+            # First rating of this user: create the row, then apply the change
+            cls.objects.get_or_create(user_id=user_id)
+            cls.objects.filter(user_id=user_id).update(**changes)
+
+
+class TechnicianRanking(models.Model):
+    """
+    Precomputed leaderboard row of a technician (any non-tenant occupation).
+    Rebuilt nightly and refreshed whenever the technician receives a rating.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="technician_ranking",
+        verbose_name=_("User"),
+    )
+    occupation = models.CharField(
+        verbose_name=_("Occupation"), max_length=20, choices=Profile.Occupation.choices
+    )
+    score = models.FloatField(verbose_name=_("Score"))
+    average_rating = models.FloatField(verbose_name=_("Average rating"))
+    rating_count = models.PositiveIntegerField(verbose_name=_("Number of ratings"))
+    reputation = models.IntegerField(verbose_name=_("Reputation"))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Technician ranking")
+        verbose_name_plural = _("Technician rankings")
+        ordering = ["occupation", "-score", "user_id"]
+        indexes = [
+            # Top-K of an occupation is a range read of this index
+            models.Index(fields=["occupation", "-score", "user"], name="ranking_occupation_score_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user} {self.occupation} {self.score:.2f}"
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+
+from .models import Rating
+
+User = get_user_model()
+
+
+class RatingSerializer(serializers.ModelSerializer):
+    rated_user_username = serializers.SlugRelatedField(
+        source="rated_user",
+        slug_field="username",
+        queryset=User.objects.filter(is_active=True),
+        write_only=True,
+    )
+    rated_user = serializers.ReadOnlyField(source="rated_user.username")
+    rating_user = serializers.ReadOnlyField(source="rating_user.get_full_name")
+
+    class Meta:
+        model = Rating
+        fields = [
+            "id",
+            "rated_user_username",
+            "rated_user",
+            "rating_user",
+            "rating",
+            "comment",
+            "created_at",
+        ]
+
+    def validate(self, attrs: dict) -> dict:
+        rating_user = self.context["request"].user
+        rated_user = attrs["rated_user"]
+        if rated_user == rating_user:
+            raise serializers.ValidationError({"rated_user_username": ["You cannot rate yourself."]})
+        if Rating.objects.filter(rated_user=rated_user, rating_user=rating_user).exists():
+            raise serializers.ValidationError(
+                {"rated_user_username": ["You have already rated this user."]}
+            )
+        return attrs
+
+
+class RatingSummarySerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    average = serializers.FloatField()
+    histogram = serializers.DictField(child=serializers.IntegerField())
+
+
+class TechnicianRankingSerializer(serializers.Serializer):
+    rank = serializers.IntegerField()
+    username = serializers.CharField(source="user.username")
+    full_name = serializers.CharField(source="user.get_full_name")
+    score = serializers.FloatField()
+    average_rating = serializers.FloatField()
+    rating_count = serializers.IntegerField()
+    reputation = serializers.IntegerField()
@@ -0,0 +1,50 @@
+from typing import Type
+
+from django.db import transaction
+from django.db.models.base import ModelBase
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core_apps.profiles.models import Profile
+
+from .models import Rating, RatingSummary
+from .tasks import refresh_technician_rankings
+
+
+def _refresh_rankings_on_commit(*user_ids: int) -> None:
+    transaction.on_commit(lambda: refresh_technician_rankings.delay(list(user_ids)))
+
+
+@receiver(post_save, sender=Rating)
+def update_rating_summary_on_save(
+    sender: Type[ModelBase], instance: Rating, created: bool, **kwargs
+) -> None:
+    if created:
+        RatingSummary.apply(instance.rated_user_id, instance.rating, 1)
+        _refresh_rankings_on_commit(instance.rated_user_id)
+        return
+
+    if not (instance.has_changed("rating") or instance.has_changed("rated_user")):
+        return
+    previous_user_id = instance.get_initial_value("rated_user")
+    RatingSummary.apply(previous_user_id, instance.get_initial_value("rating"), -1)
+    RatingSummary.apply(instance.rated_user_id, instance.rating, 1)
+    _refresh_rankings_on_commit(previous_user_id, instance.rated_user_id)
+
+
+@receiver(post_delete, sender=Rating)
+def update_rating_summary_on_delete(sender: Type[ModelBase], instance: Rating, **kwargs) -> None:
+    RatingSummary.apply(instance.rated_user_id, instance.rating, -1)
+    _refresh_rankings_on_commit(instance.rated_user_id)
+
+
+@receiver(post_save, sender=Profile)
+def refresh_ranking_on_profile_change(
+    sender: Type[ModelBase], instance: Profile, created: bool, **kwargs
+) -> None:
+    # The occupation decides the leaderboard a technician is ranked in, the
+    # reputation weighs their score
+    if created and instance.occupation == Profile.Occupation.TENANT:
+        return
+    if created or instance.has_changed("occupation") or instance.has_changed("reputation"):
+        _refresh_rankings_on_commit(instance.user_id)
@@ -0,0 +1,15 @@
+from typing import List
+
+from celery import shared_task
+
+from .leaderboard import rebuild_rankings, refresh_rankings
+
+
+@shared_task(name="rebuild_technician_rankings")
+def rebuild_technician_rankings() -> int:
+    return rebuild_rankings()
+
+
+@shared_task(name="refresh_technician_rankings")
+def refresh_technician_rankings(user_ids: List[int]) -> int:
+    return refresh_rankings(user_ids)
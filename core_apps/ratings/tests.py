@@ -1,3 +1,134 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import pytest
+from django.contrib.auth import get_user_model
+
+from core_apps.profiles.models import Profile
+from core_apps.profiles.tasks import update_reputation_score
+
+from .models import Rating, RatingSummary
+from .tasks import refresh_technician_rankings
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+def make_user(name: str, **extra_fields):
+    return User.objects.create_user(
+        username=name, email=f"{name}@example.com", password="pass1234!", **extra_fields
+    )
+
+
+@pytest.fixture
+def ranking_refreshes():
+    with mock.patch.object(refresh_technician_rankings, "delay") as delay:
+        yield delay
+
+
+def summary(user) -> tuple:
+    row = RatingSummary.objects.filter(user=user).first()
+    if row is None:
+        return None
+    return row.count, row.total, row.histogram
+
+
+def test_summary_counts_created_ratings(ranking_refreshes):
+    rated, first, second = make_user("rated"), make_user("first"), make_user("second")
+
+    Rating.objects.create(rated_user=rated, rating_user=first, rating=5)
+    Rating.objects.create(rated_user=rated, rating_user=second, rating=2)
+
+    assert summary(rated) == (2, 7, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+    assert RatingSummary.objects.get(user=rated).average == 3.5
+
+
+def test_summary_follows_an_edited_rating(ranking_refreshes):
+    rated, rater = make_user("rated"), make_user("rater")
+    rating = Rating.objects.create(rated_user=rated, rating_user=rater, rating=5)
+
+    rating.rating = 3
+    rating.save()
+
+    assert summary(rated) == (1, 3, {1: 0, 2: 0, 3: 1, 4: 0, 5: 0})
+
+
+def test_unchanged_rating_leaves_summary_alone(ranking_refreshes):
+    rated, rater = make_user("rated"), make_user("rater")
+    rating = Rating.objects.create(rated_user=rated, rating_user=rater, rating=4)
+
+    rating.comment = "Quick and tidy"
+    with mock.patch.object(RatingSummary, "apply") as apply:
+        rating.save()
+
+    apply.assert_not_called()
+    assert summary(rated) == (1, 4, {1: 0, 2: 0, 3: 0, 4: 1, 5: 0})
+
+
+def test_summary_removes_a_deleted_rating(ranking_refreshes):
+    rated, rater = make_user("rated"), make_user("rater")
+    rating = Rating.objects.create(rated_user=rated, rating_user=rater, rating=4)
+
+    rating.delete()
+
+    assert summary(rated) == (0, 0, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0})
+    assert RatingSummary.objects.get(user=rated).average == 0.0
+
+
+def test_summary_moves_with_the_rated_user(django_capture_on_commit_callbacks, ranking_refreshes):
+    previous, current, rater = make_user("previous"), make_user("current"), make_user("rater")
+    rating = Rating.objects.create(rated_user=previous, rating_user=rater, rating=2)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rating.rated_user = current
+        rating.rating = 4
+        rating.save()
+
+    assert summary(previous) == (0, 0, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0})
+    assert summary(current) == (1, 4, {1: 0, 2: 0, 3: 0, 4: 1, 5: 0})
+    ranking_refreshes.assert_called_once_with([previous.pkid, current.pkid])
+
+
+def test_removing_from_a_missing_summary_creates_nothing():
+    user = make_user("unrated")
+
+    RatingSummary.apply(user.pkid, 3, -1)
+
+    assert summary(user) is None
+
+
+def test_occupation_change_refreshes_the_ranking(django_capture_on_commit_callbacks, ranking_refreshes):
+    user = make_user("technician")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile = Profile.objects.get(user=user)
+        profile.bio = "Twenty years on the job"
+        profile.save()
+    ranking_refreshes.assert_not_called()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.occupation = Profile.Occupation.Plumber
+        profile.save()
+    ranking_refreshes.assert_called_once_with([user.pkid])
+
+
+def test_report_refreshes_the_ranking(django_capture_on_commit_callbacks, ranking_refreshes):
+    user = make_user("technician")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Profile.record_report(user.pkid)
+
+    ranking_refreshes.assert_called_once_with([user.pkid])
+
+
+def test_reputation_recompute_refreshes_only_changed_rankings(
+    django_capture_on_commit_callbacks, ranking_refreshes
+):
+    drifted = make_user("drifted")
+    make_user("steady")
+    Profile.objects.filter(user=drifted).update(reputation=10)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert update_reputation_score()["changed"] == 1
+
+    ranking_refreshes.assert_called_once_with([drifted.pkid])
@@ -0,0 +1,23 @@
+from django.urls import path
+
+from .views import (
+    RatingCreateAPIView,
+    TechnicianLeaderboardAPIView,
+    UserRatingListAPIView,
+    UserRatingSummaryAPIView,
+)
+
+urlpatterns = [
+    path("", RatingCreateAPIView.as_view(), name="rating-create"),
+    path("users/<str:username>/", UserRatingListAPIView.as_view(), name="user-ratings"),
+    path(
+        "users/<str:username>/summary/",
+        UserRatingSummaryAPIView.as_view(),
+        name="user-rating-summary",
+    ),
+    path(
+        "leaderboard/<str:occupation>/",
+        TechnicianLeaderboardAPIView.as_view(),
+        name="technician-leaderboard",
+    ),
+]
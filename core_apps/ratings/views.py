@@ -1,3 +1,90 @@
-from django.shortcuts import render
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.shortcuts import get_object_or_404
+from django.http import Http404
+from rest_framework import generics, permissions, serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from core_apps.common.pagination import StandardResultsSetPagination
+from core_apps.common.renderers import GenericJSONRenderer
+from core_apps.profiles.models import Profile
+
+from .models import Rating, RatingSummary, TechnicianRanking
+from .serializers import RatingSerializer, RatingSummarySerializer, TechnicianRankingSerializer
+
+User = get_user_model()
+
+
+class RatingCreateAPIView(generics.CreateAPIView):
+    queryset = Rating.objects.all()
+    serializer_class = RatingSerializer
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "rating"
+
+    def perform_create(self, serializer: RatingSerializer) -> None:
+        # The rating and its summary update commit together
+        try:
+            with transaction.atomic():
+                serializer.save(rating_user=self.request.user)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"rated_user_username": ["You have already rated this user."]}
+            )
+
+
+class UserRatingListAPIView(generics.ListAPIView):
+    serializer_class = RatingSerializer
+    renderer_classes = [GenericJSONRenderer]
+    pagination_class = StandardResultsSetPagination
+    object_label = "ratings"
+
+    def get_queryset(self):
+        return Rating.objects.select_related("rated_user", "rating_user").filter(
+            rated_user__username=self.kwargs["username"]
+        )
+
+
+class UserRatingSummaryAPIView(generics.RetrieveAPIView):
+    serializer_class = RatingSummarySerializer
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "rating_summary"
+
+    def get_object(self) -> RatingSummary:
+        user = get_object_or_404(User, username=self.kwargs["username"])
+        # A user who was never rated has no summary row yet
+        return RatingSummary.objects.filter(user=user).first() or RatingSummary(user=user)
+
+
+class TechnicianLeaderboardAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "leaderboard"
+    default_limit = 10
+    max_limit = 100
+
+    def get(self, request: Request, occupation: str) -> Response:
+        if occupation not in Profile.Occupation.values or occupation == Profile.Occupation.TENANT:
+            raise Http404("Unknown technician occupation.")
+
+        try:
+            limit = min(int(request.query_params.get("limit", self.default_limit)), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+
+        # Reads the first rows of ranking_occupation_score_idx, no sort
+        rankings = list(
+            TechnicianRanking.objects.filter(occupation=occupation)
+            .select_related("user")
+            .order_by("-score", "user_id")[: max(limit, 1)]
+        )
+        for rank, ranking in enumerate(rankings, start=1):
+            ranking.rank = rank
+
+        return Response(
+            {
+                "occupation": occupation,
+                "results": TechnicianRankingSerializer(rankings, many=True).data,
+            }
+        )
@@ -1,44 +1,39 @@
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
 
-from backend.settings.local import SITE_NAME, DEFAULT_FROM_EMAIL
+from core_apps.common.notifications import enqueue_notification, notification
 
 User = get_user_model()
 
 
-def send_warning_email(user: User, title: str, description: str) -> None:
-    subject = f"Warning: {user.get_full_name} You have been reported!"
-    from_email = DEFAULT_FROM_EMAIL
-    recipient_list = [user.email]
+def _user_notification(subject: str, user_id: int, title: str, description: str):
+    user = User.objects.filter(pkid=user_id).first()
+    if user is None:
+        return None
     context = {
         "user": user,
         "title": title,
         "description": description,
-        "site_name": SITE_NAME,
     }
-    html_email = render_to_string("emails/warning_email.html", context)
-    text_email = strip_tags(html_email)
+    return subject.format(full_name=user.get_full_name), [user.email], context
 
-    email = EmailMultiAlternatives(subject, text_email, from_email, recipient_list)
-    email.attach_alternative(html_email, "text/html")
-    email.send()
 
+@notification("report_warning", template_name="emails/warning_email.html")
+def build_warning_email(user_id: int, title: str, description: str):
+    return _user_notification(
+        "Warning: {full_name} You have been reported!", user_id, title, description
+    )
+
+
+@notification("report_deactivation", template_name="emails/deactivation_email.html")
+def build_deactivation_email(user_id: int, title: str, description: str):
+    return _user_notification(
+        "Account Deactivation and Eviction Notice! : {full_name}", user_id, title, description
+    )
+
+
+def send_warning_email(user_id: int, title: str, description: str) -> None:
+    enqueue_notification("report_warning", user_id=user_id, title=title, description=description)
 
-def send_deactivation_email(user: User, title: str, description: str) -> None:
-    subject = f"Account Deactivation and Eviction Notice! : {user.get_full_name}"
-    from_email = DEFAULT_FROM_EMAIL
-    recipient_list = [user.email]
-    context = {
-        "user": user,
-        "title": title,
-        "description": description,
-        "site_name": SITE_NAME,
-    }
-    html_email = render_to_string("emails/deactivation_email.html", context)
-    text_email = strip_tags(html_email)
 
-    email = EmailMultiAlternatives(subject, text_email, from_email, recipient_list)
-    email.attach_alternative(html_email, "text/html")
-    email.send()
\ No newline at end of file
+def send_deactivation_email(user_id: int, title: str, description: str) -> None:
+    enqueue_notification("report_deactivation", user_id=user_id, title=title, description=description)
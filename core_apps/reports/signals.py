@@ -4,27 +4,37 @@ from django.db.models.base import ModelBase
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from .emails import send_deactivation_email, send_warning_email
+from core_apps.common.cookie_auth import forget_cached_user
+from core_apps.profiles.models import Profile
+
 from .models import Report
+from .tasks import DEACTIVATE, WARN, process_moderation_action
+
+DEACTIVATION_THRESHOLD = 5
 
 
 @receiver(post_save, sender=Report)
 def update_user_report_count_and_reputation(
     sender: Type[ModelBase], instance: Report, created: bool, **kwargs
 ) -> None:
-    if created:
-        with transaction.atomic():
-            reported_user_profile = instance.reported_user.profile
-            reported_user_profile.report_count += 1
-            reported_user_profile.save()
+    if not created:
+        return
+
+    # One atomic UPDATE: concurrent reports against the same user cannot lose increments
+    report_count = Profile.record_report(instance.reported_user_id)
+    forget_cached_user(instance.reported_user.id)
+    if report_count == 1:
+        action = WARN
+    elif report_count is not None and report_count >= DEACTIVATION_THRESHOLD:
+        action = DEACTIVATE
+    else:
+        return
 
-            if reported_user_profile.report_count == 1:
-                send_warning_email(
-                    instance.reported_user, instance.title, instance.description
-                )
-            elif reported_user_profile.report_count >= 5:
-                instance.reported_user.is_active = False
-                instance.reported_user.save()
-                send_deactivation_email(
-                    instance.reported_user, instance.title, instance.description
-                )
\ No newline at end of file
+    payload = {
+        "action": action,
+        "user_id": instance.reported_user_id,
+        "title": instance.title,
+        "description": instance.description,
+    }
+    # Threshold actions run in the moderation queue once the report is committed
+    transaction.on_commit(lambda: process_moderation_action.delay(**payload))
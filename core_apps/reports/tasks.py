@@ -0,0 +1,33 @@
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+from core_apps.common.cookie_auth import forget_cached_user
+
+from .emails import send_deactivation_email, send_warning_email
+
+User = get_user_model()
+
+WARN = "warn"
+DEACTIVATE = "deactivate"
+
+
+@shared_task(name="process_moderation_action")
+def process_moderation_action(action: str, user_id: int, title: str, description: str) -> bool:
+    """
+    Applies a report threshold action to a user. Returns False when there was
+    nothing to do, e.g. the user is already deactivated.
+    """
+    if action == WARN:
+        send_warning_email(user_id, title, description)
+        return True
+
+    if action == DEACTIVATE:
+        # Conditional UPDATE: a burst of reports deactivates and notifies only once
+        deactivated = User.objects.filter(pkid=user_id, is_active=True).update(is_active=False)
+        if deactivated:
+            # The UPDATE bypasses post_save, a cached authentication would outlive it
+            forget_cached_user(User.objects.values_list("id", flat=True).get(pkid=user_id))
+            send_deactivation_email(user_id, title, description)
+        return bool(deactivated)
+
+    raise ValueError(f"Unknown moderation action: {action}")
@@ -0,0 +1,121 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from core_apps.common.tasks import send_notifications
+from core_apps.profiles.models import Profile
+from core_apps.ratings.tasks import refresh_technician_rankings
+
+from .models import Report
+from .tasks import DEACTIVATE, WARN, process_moderation_action
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+def make_user(name: str, **extra_fields):
+    return User.objects.create_user(
+        username=name, email=f"{name}@example.com", password="pass1234!", **extra_fields
+    )
+
+
+@pytest.fixture(autouse=True)
+def ranking_refreshes():
+    # Every report lowers the reputation the technician rankings are weighted by
+    with mock.patch.object(refresh_technician_rankings, "delay") as delay:
+        yield delay
+
+
+@pytest.fixture
+def moderation_actions():
+    with mock.patch.object(process_moderation_action, "delay") as delay:
+        yield delay
+
+
+def report(reporter, reported_user, number: int = 0) -> Report:
+    return Report.objects.create(
+        title=f"Report {number}",
+        reported_by=reporter,
+        reported_user=reported_user,
+        description="Noise at night",
+    )
+
+
+def test_each_report_counts_once_and_lowers_reputation(
+    django_capture_on_commit_callbacks, moderation_actions
+):
+    reporter, reported = make_user("reporter"), make_user("reported")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for number in range(3):
+            report(reporter, reported, number)
+
+    profile = Profile.objects.get(user=reported)
+    assert profile.report_count == 3
+    assert profile.reputation == Profile.REPUTATION_MAX - 3 * Profile.REPORT_PENALTY
+
+
+def test_reputation_never_goes_below_zero(django_capture_on_commit_callbacks, moderation_actions):
+    reporter, reported = make_user("reporter"), make_user("reported")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for number in range(7):
+            report(reporter, reported, number)
+
+    profile = Profile.objects.get(user=reported)
+    assert (profile.report_count, profile.reputation) == (7, 0)
+    # The rule applied by save() agrees with the one applied in SQL
+    profile.save()
+    profile.refresh_from_db()
+    assert profile.reputation == 0
+
+
+def test_record_report_without_profile_returns_none():
+    user = make_user("no-profile")
+    Profile.objects.filter(user=user).delete()
+
+    assert Profile.record_report(user.pkid) is None
+
+
+def test_first_report_warns_and_fifth_deactivates(
+    django_capture_on_commit_callbacks, moderation_actions
+):
+    reporter, reported = make_user("reporter"), make_user("reported")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for number in range(6):
+            report(reporter, reported, number)
+
+    actions = [call.kwargs["action"] for call in moderation_actions.call_args_list]
+    assert actions == [WARN, DEACTIVATE, DEACTIVATE]
+    assert all(call.kwargs["user_id"] == reported.pkid for call in moderation_actions.call_args_list)
+
+
+def test_moderation_action_is_queued_only_on_commit(
+    django_capture_on_commit_callbacks, moderation_actions
+):
+    reporter, reported = make_user("reporter"), make_user("reported")
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        report(reporter, reported)
+    assert not moderation_actions.called
+
+    for callback in callbacks:
+        callback()
+    moderation_actions.assert_called_once()
+
+
+def test_deactivation_runs_once(django_capture_on_commit_callbacks):
+    reported = make_user("reported")
+
+    with mock.patch.object(send_notifications, "delay") as send:
+        with django_capture_on_commit_callbacks(execute=True):
+            assert process_moderation_action(DEACTIVATE, reported.pkid, "Report", "Noise") is True
+            assert process_moderation_action(DEACTIVATE, reported.pkid, "Report", "Noise") is False
+
+    reported.refresh_from_db()
+    assert not reported.is_active
+    send.assert_called_once()
+    assert [payload["name"] for payload in send.call_args.args[0]] == ["report_deactivation"]
@@ -10,6 +10,8 @@ class ReportCreateAPIView(generics.CreateAPIView):
     serializer_class = ReportSerializer
     renderer_classes = [GenericJSONRenderer]
     object_label = "report"
+    # Stricter than the default user rate: every report moderates a user
+    throttle_scope = "reports"
 
     def perform_create(self, serializer: serializers.Serializer) -> None:
         serializer.save(reported_by=self.request.user)
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
+from core_apps.common.search import TrigramSearchAdminMixin
 from .forms import UserChangeForm, UserCreationForm
 from core_apps.profiles.models import Profile
 from django.utils.html import  format_html
@@ -51,7 +52,7 @@ class ProfileInline(admin.StackedInline):
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(TrigramSearchAdminMixin, BaseUserAdmin):
     form = UserChangeForm
     add_form = UserCreationForm
     inlines = (ProfileInline,)
@@ -75,7 +76,8 @@ class UserAdmin(BaseUserAdmin):
 
     ]
     list_display_links = ["pkid", "id", "email", "username"]
-    search_fields = ["email", "first_name", "last_name", "username"]
+    # Indexed trigram search over the names, exact match on the email
+    search_fields = [*User.SEARCH_FIELDS, "=email"]
     ordering = ["pkid"]
     list_select_related = ('profile',)
 
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:53
+
+import core_apps.common.search
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    core_apps.common.search.SearchDocument(
+                        "username", "first_name", "last_name"
+                    ),
+                    name="gin_trgm_ops",
+                ),
+                name="user_search_trgm_idx",
+            ),
+        ),
+    ]
@@ -1,8 +1,10 @@
 import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core import validators
 from django.utils.translation import gettext_lazy as _
+from core_apps.common.search import SearchDocument
 from core_apps.users.managers import UserManager
 
 
@@ -35,12 +37,21 @@ class User(AbstractUser):
 
     REQUIRED_FIELDS = ["username", "first_name", "last_name"]
 
+    # Fields of the indexed search document, searches must list them in this order
+    SEARCH_FIELDS = ["username", "first_name", "last_name"]
+
     objects = UserManager()
 
     class Meta:
         verbose_name = _("User")
         verbose_name_plural = _("Users")
         ordering = ["-date_joined"]
+        indexes = [
+            GinIndex(
+                OpClass(SearchDocument("username", "first_name", "last_name"), name="gin_trgm_ops"),
+                name="user_search_trgm_idx",
+            ),
+        ]
 
     @property
     def get_full_name(self) -> str: